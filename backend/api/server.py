@@ -2602,6 +2602,54 @@ except ImportError as e:
     AUTOMATION_AVAILABLE = False
     logger.warning(f"Automation modules not available: {e}")
 
+# orjson is optional - fall back to the stdlib decoder for the scan history log
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    import json as _json
+    ORJSON_AVAILABLE = False
+
+from collections import deque
+from pathlib import Path
+
+# Append-only JSON-lines log, one scan per line (newest last)
+SCAN_HISTORY_FILE = Path(__file__).parent.parent / "automation" / "scan_history.jsonl"
+
+
+# Single JSON document ({"scans": [...]}) used before the log; still read as a fallback
+LEGACY_SCAN_HISTORY_FILE = Path(__file__).parent.parent / "automation" / "scan_history.json"
+
+
+def _loads_scan_history(raw: bytes) -> Any:
+    """Parse one scan history document or log line."""
+    return orjson.loads(raw) if ORJSON_AVAILABLE else _json.loads(raw)
+
+
+def _read_latest_scan() -> Optional[Dict[str, Any]]:
+    """
+    Return the most recent scan history entry.
+    
+    The whole log is streamed line by line, but only the last two lines are
+    kept and parsed. A torn final line (a crash mid-append) falls back to the
+    entry before it; without a readable log, the legacy scan_history.json is
+    used.
+    """
+    if SCAN_HISTORY_FILE.exists():
+        with open(SCAN_HISTORY_FILE, 'rb') as f:
+            tail = deque(f, maxlen=2)
+        for line in reversed(tail):
+            try:
+                return _loads_scan_history(line)
+            except ValueError:
+                logger.warning("Skipping unreadable scan history entry")
+    
+    if LEGACY_SCAN_HISTORY_FILE.exists():
+        scans = _loads_scan_history(LEGACY_SCAN_HISTORY_FILE.read_bytes()).get("scans")
+        if scans:
+            return scans[-1]
+    return None
+
 
 @app.get("/api/eis/automation/status")
 async def get_automation_status():
@@ -2609,6 +2657,18 @@ async def get_automation_status():
     from pathlib import Path
     import json
     
+    # Automation disabled: nothing can have been scanned or sent, skip the filesystem
+    if not AUTOMATION_AVAILABLE:
+        return {
+            "automation_available": False,
+            "last_scan": None,
+            "subscriber_count": 0,
+            "newsletters_generated": 0,
+            "scans_available": 0,
+            "gmail_configured": bool(os.environ.get("GMAIL_ADDRESS")),
+            "companies_house_configured": bool(os.environ.get("COMPANIES_HOUSE_API_KEY"))
+        }
+    
     automation_dir = Path(__file__).parent.parent / "automation"
     output_dir = automation_dir / "output"
     scans_dir = output_dir / "scans" if output_dir.exists() else automation_dir / "scans"
@@ -2627,7 +2687,7 @@ async def get_automation_status():
                     "total_found": scan_data.get("total_found", 0),
                     "companies": len(scan_data.get("companies", []))
                 }
-        except:
+        except (OSError, ValueError):
             pass
     
     # Get subscriber count
@@ -2638,7 +2698,7 @@ async def get_automation_status():
             with open(subscribers_file, 'r') as f:
                 data = json.load(f)
                 subscriber_count = len(data.get("subscribers", []))
-        except:
+        except (OSError, ValueError):
             pass
     
     # Get newsletter history
@@ -2809,7 +2869,7 @@ async def get_scan_history(limit: int = Query(default=10, ge=1, le=50)):
                     "timestamp": data.get("scan_timestamp"),
                     "total_found": data.get("total_found", 0)
                 })
-        except:
+        except (OSError, ValueError):
             continue
     
     return {"scans": history, "count": len(history)}
@@ -3012,67 +3072,62 @@ async def send_email_now(request: Dict = Body(...)):
             })
         
         # 2. Latest Scan Results (from scan history)
-        scan_history_path = Path(__file__).parent.parent / "automation" / "scan_history.json"
-        if scan_history_path.exists():
-            try:
-                with open(scan_history_path, 'r') as f:
-                    scan_history = json.load(f)
+        try:
+            latest_scan = _read_latest_scan()
+            if latest_scan:
+                scan_companies = latest_scan.get("companies_found", [])[:3]
                 
-                if scan_history.get("scans"):
-                    latest_scan = scan_history["scans"][-1]
-                    scan_companies = latest_scan.get("companies_found", [])[:3]
-                    
-                    for sc in scan_companies:
-                        if not any(c['company_number'] == sc.get('company_number') for c in sections["portfolio"]):
-                            company_name = sc.get('company_name', 'Unknown')
-                            company_number = sc.get('company_number', '')
-                            sic_codes = sc.get('sic_codes', [])
-                            sector = get_sector_name(sic_codes)
-                            eis_score = sc.get('eis_score', 0)
-                            eis_status = sc.get('eis_status', 'Unknown')
-                            
-                            # Get news for scan results too
-                            news_summary = None
-                            news_sources = []
-                            if news_enabled and company_name != 'Unknown':
-                                try:
-                                    research = researcher.search(company_name, sic_codes, max_results=2)
-                                    if research.get('success') and research.get('results'):
-                                        edit_result = editor.summarize(
-                                            company_name=company_name,
-                                            raw_results=research.get('results', []),
-                                            eis_score=eis_score,
-                                            sector=sector
-                                        )
-                                        if edit_result.get('is_relevant'):
-                                            news_summary = edit_result.get('summary')
-                                            news_sources = edit_result.get('sources', [])[:2]
-                                except Exception as e:
-                                    logger.warning(f"Could not get news for {company_name}: {e}")
-                            
-                            if news_summary:
-                                narrative = news_summary
-                            else:
-                                company_data = {
-                                    'company_name': company_name,
-                                    'company_number': company_number,
-                                    'eis_assessment': {'score': eis_score, 'status': eis_status},
-                                    'full_profile': {'company': {'sic_codes': sic_codes}}
-                                }
-                                narrative = writer.generate_deal_highlight(company_data)
-                            
-                            sections["scan_results"].append({
-                                "company_name": company_name,
-                                "company_number": company_number,
-                                "eis_score": eis_score,
-                                "eis_status": eis_status,
-                                "sector": sector,
-                                "narrative": narrative,
-                                "has_news": bool(news_summary),
-                                "news_sources": news_sources
-                            })
-            except Exception as e:
-                logger.warning(f"Could not load scan history: {e}")
+                for sc in scan_companies:
+                    if not any(c['company_number'] == sc.get('company_number') for c in sections["portfolio"]):
+                        company_name = sc.get('company_name', 'Unknown')
+                        company_number = sc.get('company_number', '')
+                        sic_codes = sc.get('sic_codes', [])
+                        sector = get_sector_name(sic_codes)
+                        eis_score = sc.get('eis_score', 0)
+                        eis_status = sc.get('eis_status', 'Unknown')
+                        
+                        # Get news for scan results too
+                        news_summary = None
+                        news_sources = []
+                        if news_enabled and company_name != 'Unknown':
+                            try:
+                                research = researcher.search(company_name, sic_codes, max_results=2)
+                                if research.get('success') and research.get('results'):
+                                    edit_result = editor.summarize(
+                                        company_name=company_name,
+                                        raw_results=research.get('results', []),
+                                        eis_score=eis_score,
+                                        sector=sector
+                                    )
+                                    if edit_result.get('is_relevant'):
+                                        news_summary = edit_result.get('summary')
+                                        news_sources = edit_result.get('sources', [])[:2]
+                            except Exception as e:
+                                logger.warning(f"Could not get news for {company_name}: {e}")
+                        
+                        if news_summary:
+                            narrative = news_summary
+                        else:
+                            company_data = {
+                                'company_name': company_name,
+                                'company_number': company_number,
+                                'eis_assessment': {'score': eis_score, 'status': eis_status},
+                                'full_profile': {'company': {'sic_codes': sic_codes}}
+                            }
+                            narrative = writer.generate_deal_highlight(company_data)
+                        
+                        sections["scan_results"].append({
+                            "company_name": company_name,
+                            "company_number": company_number,
+                            "eis_score": eis_score,
+                            "eis_status": eis_status,
+                            "sector": sector,
+                            "narrative": narrative,
+                            "has_news": bool(news_summary),
+                            "news_sources": news_sources
+                        })
+        except Exception as e:
+            logger.warning(f"Could not load scan history: {e}")
         
         # 3. Featured Companies - if no real data, use high-quality samples with news
         if not sections["portfolio"] and not sections["scan_results"]:
@@ -3226,17 +3281,32 @@ async def send_email_now(request: Dict = Body(...)):
                 "companies_count": len(formatted_companies)
             }
         
-        # Import professional mailer and send
-        from automation.mailer import ProfessionalNewsletterGenerator
-        mailer = ProfessionalNewsletterGenerator(gmail_address=gmail_address, gmail_password=gmail_password)
+        # Queued when a Celery broker is configured; otherwise sent inline off the event loop
+        from fastapi.concurrency import run_in_threadpool
+        from tasks import dispatch_portfolio_newsletter
         
-        results = mailer.send_newsletter(
-            newsletter_data=newsletter_data,
-            recipients=[email],
-            test_mode=False
+        results = await run_in_threadpool(
+            dispatch_portfolio_newsletter, newsletter_data, [email],
+            gmail_address=gmail_address, gmail_password=gmail_password
         )
         
-        if results.get("sent", 0) > 0:
+        sections_count = {
+            "portfolio": len(sections["portfolio"]),
+            "scan_results": len(sections["scan_results"]),
+            "featured": len(sections["featured"])
+        }
+        
+        if results.get("queued"):
+            return {
+                "success": True,
+                "message": f"Professional EIS Intelligence Report queued for {email}",
+                "email": email,
+                "queued": True,
+                "task_id": results["task_id"],
+                "companies_included": total_companies,
+                "sections": sections_count
+            }
+        elif results.get("sent", 0) > 0:
             return {
                 "success": True,
                 "message": f"Professional EIS Intelligence Report sent to {email}",
@@ -3244,11 +3314,7 @@ async def send_email_now(request: Dict = Body(...)):
                 "sent": results["sent"],
                 "subject": results.get("subject", "EIS Portfolio Intelligence"),
                 "companies_included": total_companies,
-                "sections": {
-                    "portfolio": len(sections["portfolio"]),
-                    "scan_results": len(sections["scan_results"]),
-                    "featured": len(sections["featured"])
-                }
+                "sections": sections_count
             }
         else:
             raise HTTPException(status_code=500, detail="Failed to send email")
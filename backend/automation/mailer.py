@@ -9,19 +9,157 @@ Version: 2.0 (Professional Edition)
 """
 
 import os
+import re
 import json
+import time
+import hashlib
+import heapq
 import logging
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from datetime import datetime
-from typing import Dict, List, Any, Optional
+import atexit
+import argparse
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, List, Any, Iterable, Optional, Union
 from pathlib import Path
 
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+# smtplib, ssl and the email package are imported where mail is actually sent,
+# so processes that only render newsletters (API previews) never load them
+if TYPE_CHECKING:
+    import smtplib
+    from concurrent.futures import Future
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# orjson is optional - fall back to the stdlib parser
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _json_loads(raw: bytes) -> Any:
+    """Parse JSON bytes with orjson when installed, stdlib json otherwise."""
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
+def _read_json_file(path: Path) -> Any:
+    """Read and parse a JSON file in one shot, rejecting oversized files before reading them."""
+    size = path.stat().st_size
+    if size > MAX_JSON_BYTES:
+        raise ValueError(f"{path} is {size} bytes, limit is {MAX_JSON_BYTES}")
+    return _json_loads(path.read_bytes())
+
+
+def _json_dumps(data: Any) -> bytes:
+    """Serialize to indented JSON bytes with orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode('utf-8')
+
+
+@lru_cache(maxsize=1)
+def _ssl_context():
+    """
+    SSL context shared by every SMTP session; building one reloads the CA bundle.
+    
+    Unlike SMTP_SSL's own default context, this one verifies the server
+    certificate and hostname.
+    """
+    import ssl
+    return ssl.create_default_context()
+
+
+def _content_key(data: Dict) -> bytes:
+    """Stable digest of newsletter input data, used to reuse rendered output."""
+    if ORJSON_AVAILABLE:
+        raw = orjson.dumps(data, default=str, option=orjson.OPT_SORT_KEYS)
+    else:
+        raw = json.dumps(data, default=str, sort_keys=True).encode('utf-8')
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
 SUBSCRIBERS_FILE = Path(__file__).parent / "subscribers.json"
+TEMPLATE_DIR = Path(__file__).parent.parent / "templates"
+MAX_JSON_BYTES = 50_000_000  # Refuse to parse newsletter/subscriber files beyond this size
+
+# Deliberately loose: catches typos and junk before they cost an SMTP round-trip
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+# Gmail SMTP settings
+SMTP_HOST = 'smtp.gmail.com'
+SMTP_PORT = 465
+SMTP_BATCH_SIZE = 100  # Messages per SMTP session, to stay under Gmail's per-connection cap
+SMTP_CONCURRENCY = 5  # Parallel sessions; Gmail allows ~15 per account
+SMTP_RETRY_CODES = (421, 450)  # Transient "try again later" replies
+SMTP_MAX_RETRIES = 3
+SMTP_RETRY_BACKOFF = 1.0  # Seconds, doubled on every retry
+SMTP_TIMEOUT = 30  # Seconds per socket operation, so a silently dropped pooled session fails fast
+RCPT_PLACEHOLDER = b'__RCPT__'  # Stand-in To header, patched per recipient in the wire bytes
+
+
+# Idle logged-in sessions kept between send_newsletter calls, per Gmail account:
+# {gmail_address: [(server, messages_sent_on_it)]}. Checked with NOOP before reuse.
+_SMTP_POOL: Dict[str, List[tuple]] = {}
+_SMTP_POOL_LOCK = threading.Lock()
+
+# Rendered newsletters keyed by (timestamp, content digest); retries and
+# test-then-live sends of the same data within a minute skip re-rendering
+RENDER_CACHE_SIZE = 16
+_RENDER_CACHE: "OrderedDict[tuple, Dict[str, str]]" = OrderedDict()
+_RENDER_CACHE_LOCK = threading.Lock()
+
+# How many companies each section shows; sliced once in generate_newsletter
+PORTFOLIO_TOP_N = 10  # Portfolio table rows, in both the HTML and plain-text bodies
+SPOTLIGHT_TOP_N = 2
+COMPANY_NEWS_TOP_N = 5
+
+NOT_ELIGIBLE_STATUS = 'Likely Not Eligible'
+WATCHLIST_REASONS = [
+    'Sector/SIC mismatch',
+    'Age outside standard EIS window',
+    'Unclear share allotment history',
+    'Director changes detected',
+    'Missing filing history',
+]
+_WATCHLIST_PROBES = [(reason, reason.lower()) for reason in WATCHLIST_REASONS]
+
+# EIS status classes; canonical status strings resolve with one dict lookup
+STATUS_ELIGIBLE, STATUS_REVIEW, STATUS_RISK = 0, 1, 2
+_STATUS_CLASS = {
+    'Likely Eligible': STATUS_ELIGIBLE,
+    'Eligible': STATUS_ELIGIBLE,
+    'Review Required': STATUS_REVIEW,
+    'Requires Review': STATUS_REVIEW,
+    'Likely Ineligible': STATUS_RISK,
+    'Ineligible': STATUS_RISK,
+    # 'Not Eligible' (failed mandatory gates in analytics.eis_heuristics) has
+    # always matched the Eligible substring rule: green in the portfolio table
+    # and counted as eligible. Kept as-is; those companies score 0, so their
+    # effective status is overridden to NOT_ELIGIBLE_STATUS where it is shown
+    'Not Eligible': STATUS_ELIGIBLE,
+    NOT_ELIGIBLE_STATUS: STATUS_RISK,  # Only produced by the score/zero-factor override
+    'Unknown': STATUS_RISK,
+    '': STATUS_RISK,
+}
+
+
+def _classify_status(status: str) -> int:
+    """Map an EIS status string to STATUS_ELIGIBLE, STATUS_REVIEW or STATUS_RISK."""
+    code = _STATUS_CLASS.get(status)
+    if code is not None:
+        return code
+    # Freeform statuses fall back to substring matching
+    if 'Eligible' in status and 'Ineligible' not in status:
+        return STATUS_ELIGIBLE
+    if 'Review' in status:
+        return STATUS_REVIEW
+    return STATUS_RISK
 
 
 class ProfessionalNewsletterGenerator:
@@ -40,6 +178,10 @@ class ProfessionalNewsletterGenerator:
     REVIEW_COLOR = "#d97706"
     RISK_COLOR = "#dc2626"
     
+    # Canonical statuses from analytics.eis_heuristics resolve with one dict lookup
+    # Indexed by status class (STATUS_ELIGIBLE, STATUS_REVIEW, STATUS_RISK)
+    _STATUS_COLORS = (ELIGIBLE_COLOR, REVIEW_COLOR, RISK_COLOR)
+    
     def __init__(self, gmail_address: str = None, gmail_password: str = None):
         self.gmail_address = gmail_address or os.environ.get('GMAIL_ADDRESS')
         self.gmail_password = gmail_password or os.environ.get('GMAIL_APP_PASSWORD')
@@ -61,41 +203,68 @@ class ProfessionalNewsletterGenerator:
         Returns:
             Dict with 'subject', 'html', 'plain_text' keys
         """
+        now = datetime.now(timezone.utc)
+        timestamp = now.strftime("%d %B %Y, %H:%M UTC")
+        cache_key = (timestamp, _content_key(data))
+        with _RENDER_CACHE_LOCK:
+            cached = _RENDER_CACHE.get(cache_key)
+            if cached is not None:
+                _RENDER_CACHE.move_to_end(cache_key)
+        if cached is not None:
+            return dict(cached)
+        
         companies = data.get('companies', [])
         ai_insights = data.get('ai_insights', [])
         sector_news = data.get('sector_news', [])  # NEW: Sector news from Tavily
-        timestamp = datetime.now().strftime("%d %B %Y, %H:%M UTC")
-        date_display = datetime.now().strftime("%d %B %Y")
+        date_display = timestamp.split(",", 1)[0]  # "%d %B %Y" without a second strftime
         
-        # Calculate portfolio stats
+        # Calculate portfolio stats in a single pass
         portfolio_count = len(companies)
-        eligible_count = sum(1 for c in companies if 'Eligible' in c.get('eis_status', '') and 'Ineligible' not in c.get('eis_status', ''))
-        review_count = sum(1 for c in companies if 'Review' in c.get('eis_status', ''))
-        risk_companies = [c for c in companies if c.get('risk_flags')]
+        eligible_count = risk_flag_count = 0
+        review_companies = []
+        companies_with_news = []
+        for c in companies:
+            code = _classify_status(c.get('eis_status', ''))
+            if code == STATUS_ELIGIBLE:
+                eligible_count += 1
+            elif code == STATUS_REVIEW:
+                review_companies.append(c)
+            if c.get('risk_flags'):
+                risk_flag_count += 1
+            if c.get('news_summary') or c.get('narrative'):
+                companies_with_news.append(c)
+        review_count = len(review_companies)
+        ineligible_count = max(0, portfolio_count - eligible_count - review_count)
+        frequency = data.get('frequency', 'Weekly')
+        
+        # Select spotlight companies (top by score)
+        spotlight = heapq.nlargest(SPOTLIGHT_TOP_N, companies, key=lambda x: x.get('eis_score', 0))
         
-        # Select spotlight companies (top 2 by score)
-        spotlight = sorted(companies, key=lambda x: x.get('eis_score', 0), reverse=True)[:2]
+        top_companies = companies[:PORTFOLIO_TOP_N]
         
         # Generate HTML
         html = self._generate_html(
-            companies=companies,
+            top_companies=top_companies,
             spotlight=spotlight,
-            risk_companies=risk_companies,
+            risk_flag_count=risk_flag_count,
+            review_companies=review_companies,
+            companies_with_news=companies_with_news[:COMPANY_NEWS_TOP_N],
             ai_insights=ai_insights,
             sector_news=sector_news,
             portfolio_count=portfolio_count,
             eligible_count=eligible_count,
             review_count=review_count,
+            ineligible_count=ineligible_count,
             date_display=date_display,
             timestamp=timestamp,
-            frequency=data.get('frequency', 'Weekly')
+            frequency=frequency,
+            next_run_text=self._next_run_text(frequency, now)
         )
         
         # Generate plain text
         plain_text = self._generate_plain_text(
-            companies=companies,
+            top_companies=top_companies,
             spotlight=spotlight,
-            risk_companies=risk_companies,
             ai_insights=ai_insights,
             portfolio_count=portfolio_count,
             eligible_count=eligible_count,
@@ -104,433 +273,106 @@ class ProfessionalNewsletterGenerator:
             timestamp=timestamp
         )
         
-        return {
-            'subject': self.generate_subject({'portfolio_count': portfolio_count, 'frequency': data.get('frequency', 'Weekly')}),
+        content = {
+            'subject': self.generate_subject({'portfolio_count': portfolio_count, 'frequency': frequency}),
             'html': html,
             'plain_text': plain_text
         }
+        
+        with _RENDER_CACHE_LOCK:
+            _RENDER_CACHE[cache_key] = content
+            if len(_RENDER_CACHE) > RENDER_CACHE_SIZE:
+                _RENDER_CACHE.popitem(last=False)
+        
+        return dict(content)
+    
+    @classmethod
+    def _status_color(cls, status: str) -> str:
+        """Palette color for an EIS status string."""
+        return cls._STATUS_COLORS[_classify_status(status)]
+    
+    @staticmethod
+    def _effective_status(c: Dict) -> str:
+        """Company status, overridden to Likely Not Eligible on a zero factor or a score below 50."""
+        factors = c.get('factors', [])
+        has_zero_factor = any(
+            (f.get('score', 1) <= 0 or f.get('value', 1) <= 0) 
+            for f in factors if isinstance(f, dict)
+        )
+        if has_zero_factor or c.get('eis_score', 0) < 50:
+            return NOT_ELIGIBLE_STATUS
+        return c.get('eis_status', 'Unknown')
+    
+    @staticmethod
+    def _recommendation(status: str) -> str:
+        """Recommended next step for a (possibly overridden) EIS status."""
+        if status == NOT_ELIGIBLE_STATUS:
+            return "Remove from EIS candidate list (zero score detected)"
+        code = _classify_status(status)
+        if code == STATUS_ELIGIBLE:
+            return "Consider HMRC Advance Assurance check"
+        if code == STATUS_REVIEW:
+            return "Confirm investment/EIS status and review changes"
+        return "Remove from EIS candidate list"
+    
+    @staticmethod
+    def _truncate(text: str, limit: int) -> str:
+        """Cut text to limit characters plus an ellipsis, leaving shorter text untouched."""
+        return text if len(text) <= limit else text[:limit] + '...'
+    
+    @staticmethod
+    def _revenue(c: Dict) -> Any:
+        """Revenue from the company record or its financial_data block."""
+        return c.get('revenue', c.get('financial_data', {}).get('revenue', 'N/A') if isinstance(c.get('financial_data'), dict) else 'N/A')
+    
+    @staticmethod
+    def _next_run_text(frequency: str, now: datetime) -> str:
+        """Next scheduled run based on frequency."""
+        frequency = frequency.lower()
+        if frequency == 'weekly':
+            days_ahead = 7 - now.weekday()
+            return (now + timedelta(days=days_ahead)).strftime("Monday %d %b %Y, 08:00")
+        if frequency == 'monthly':
+            if now.month == 12:
+                next_run_date = now.replace(year=now.year+1, month=1, day=1)
+            else:
+                next_run_date = now.replace(month=now.month+1, day=1)
+            return next_run_date.strftime("1st %b %Y, 08:00")
+        if frequency == 'yearly':
+            return now.replace(year=now.year+1, month=1, day=1).strftime("1st Jan %Y, 08:00")
+        return "On-demand (manual trigger)"
     
     def _generate_html(self, **kwargs) -> str:
         """Generate professional HTML email - clean, compact format."""
-        companies = kwargs['companies']
-        spotlight = kwargs['spotlight']
-        risk_companies = kwargs['risk_companies']
-        ai_insights = kwargs['ai_insights']
-        sector_news = kwargs.get('sector_news', [])
-        portfolio_count = kwargs['portfolio_count']
-        eligible_count = kwargs['eligible_count']
-        review_count = kwargs['review_count']
-        date_display = kwargs['date_display']
-        timestamp = kwargs['timestamp']
-        frequency = kwargs.get('frequency', 'Weekly')
-        
-        # Calculate ineligible count
-        ineligible_count = portfolio_count - eligible_count - review_count
-        if ineligible_count < 0:
-            ineligible_count = 0
-        
-        # Calculate risk flags
-        risk_flag_count = len(risk_companies)
-        
-        # Next scheduled run based on frequency
-        from datetime import datetime, timedelta
-        next_run_date = datetime.now()
-        if frequency.lower() == 'weekly':
-            days_ahead = 7 - next_run_date.weekday()
-            next_run_date = next_run_date + timedelta(days=days_ahead)
-            next_run_text = next_run_date.strftime("Monday %d %b %Y, 08:00")
-        elif frequency.lower() == 'monthly':
-            if next_run_date.month == 12:
-                next_run_date = next_run_date.replace(year=next_run_date.year+1, month=1, day=1)
-            else:
-                next_run_date = next_run_date.replace(month=next_run_date.month+1, day=1)
-            next_run_text = next_run_date.strftime("1st %b %Y, 08:00")
-        elif frequency.lower() == 'yearly':
-            next_run_date = next_run_date.replace(year=next_run_date.year+1, month=1, day=1)
-            next_run_text = next_run_date.strftime("1st Jan %Y, 08:00")
-        else:
-            next_run_text = "On-demand (manual trigger)"
-        
-        # =====================================================================
-        # TOP CHANGES - Top 3 companies with recommendations
-        # =====================================================================
-        top_changes_html = ""
-        for i, c in enumerate(spotlight[:3], 1):
-            status = c.get('eis_status', 'Unknown')
-            score = c.get('eis_score', 0)
-            company_number = c.get('company_number', 'N/A')
-            company_name = c.get('company_name', 'Unknown')
-            sector = c.get('sector', 'N/A')
-            revenue = c.get('revenue', c.get('financial_data', {}).get('revenue', 'N/A') if isinstance(c.get('financial_data'), dict) else 'N/A')
-            
-            # Check if any factor score is 0 - override to Not Eligible
-            factors = c.get('factors', [])
-            has_zero_factor = any(
-                (f.get('score', 1) <= 0 or f.get('value', 1) <= 0) 
-                for f in factors if isinstance(f, dict)
-            )
-            
-            # Determine status - override if any factor is 0 or score < 50
-            if has_zero_factor or score < 50:
-                status = 'Likely Not Eligible'
-                status_color = self.RISK_COLOR
-            elif 'Eligible' in status and 'Ineligible' not in status:
-                status_color = self.ELIGIBLE_COLOR
-            elif 'Review' in status:
-                status_color = self.REVIEW_COLOR
-            else:
-                status_color = self.RISK_COLOR
-            
-            # Generate recommendation
-            if status == 'Likely Not Eligible':
-                recommendation = "Remove from EIS candidate list (zero score detected)"
-            elif 'Eligible' in status and 'Ineligible' not in status:
-                recommendation = "Consider HMRC Advance Assurance check"
-            elif 'Review' in status:
-                recommendation = "Confirm investment/EIS status and review changes"
-            else:
-                recommendation = "Remove from EIS candidate list"
-            
-            # Get risk signals
-            risk_flags = c.get('risk_flags', [])
-            signals_text = ""
-            if risk_flags:
-                for flag in risk_flags[:2]:
-                    signals_text += f'<div style="color: {self.TEXT_SECONDARY}; font-size: 13px; margin: 3px 0 3px 15px;">• {flag}</div>'
-            else:
-                signals_text = f'<div style="color: {self.TEXT_SECONDARY}; font-size: 13px; margin: 3px 0 3px 15px;">• No adverse filings detected</div>'
-            
-            top_changes_html += f'''
-            <div style="margin-bottom: 16px; padding-bottom: 16px; border-bottom: 1px solid {self.BORDER_COLOR};">
-                <div style="font-weight: 600; color: {self.TEXT_PRIMARY}; font-size: 14px; margin-bottom: 6px;">
-                    {i}) {company_name} ({company_number}) — 
-                    <span style="color: {status_color};">{status}</span>
-                    <span style="color: {self.HEADER_BG}; font-weight: 700;">(Score: {score}/100)</span>
-                </div>
-                <div style="color: {self.TEXT_SECONDARY}; font-size: 12px; margin: 4px 0 4px 15px;">
-                    💰 Revenue: {revenue} | 🏢 Sector: {sector}
-                </div>
-                {signals_text}
-                <div style="color: {self.TEXT_SECONDARY}; font-size: 13px; margin: 6px 0 0 15px; font-style: italic;">
-                    → Recommended action: {recommendation}
-                </div>
-            </div>
-            '''
-        
-        if not top_changes_html:
-            top_changes_html = f'<p style="color: {self.TEXT_SECONDARY}; font-size: 13px;">No companies to highlight this period.</p>'
-        
-        # =====================================================================
-        # WATCHLIST - Companies needing review
-        # =====================================================================
-        review_companies = [c for c in companies if 'Review' in c.get('eis_status', '')]
-        watchlist_html = ""
-        if review_companies:
-            watchlist_html = f'<p style="color: {self.TEXT_PRIMARY}; font-size: 13px; margin-bottom: 10px;">{len(review_companies)} companies need manual verification due to missing/ambiguous signals:</p>'
-            watchlist_html += '<ul style="margin: 0; padding-left: 20px;">'
-            for reason in ['Sector/SIC mismatch', 'Age outside standard EIS window', 'Unclear share allotment history', 'Director changes detected', 'Missing filing history']:
-                if any(reason.lower() in str(c.get('risk_flags', [])).lower() for c in review_companies):
-                    watchlist_html += f'<li style="color: {self.TEXT_SECONDARY}; font-size: 13px; margin: 4px 0;">{reason}</li>'
-            watchlist_html += '</ul>'
-        else:
-            watchlist_html = f'<p style="color: {self.TEXT_SECONDARY}; font-size: 13px;">No companies currently flagged for review.</p>'
-        
-        # =====================================================================
-        # AI COMPANY INTELLIGENCE - Tavily-researched news for each company
-        # =====================================================================
-        company_news_html = ""
-        companies_with_news = [c for c in companies if c.get('news_summary') or c.get('narrative')]
-        
-        if companies_with_news:
-            for c in companies_with_news[:5]:  # Top 5 companies with news
-                company_name = c.get('company_name', 'Unknown')
-                company_number = c.get('company_number', 'N/A')
-                news_summary = c.get('news_summary', c.get('narrative', ''))
-                news_sources = c.get('news_sources', [])
-                sector = c.get('sector', 'N/A')
-                score = c.get('eis_score', 0)
-                revenue = c.get('revenue', c.get('financial_data', {}).get('revenue', 'N/A') if isinstance(c.get('financial_data'), dict) else 'N/A')
-                
-                # Check if any factor score is 0 - override to Not Eligible
-                factors = c.get('factors', [])
-                has_zero_factor = any(
-                    (f.get('score', 1) <= 0 or f.get('value', 1) <= 0) 
-                    for f in factors if isinstance(f, dict)
-                )
-                
-                # Status and color with zero-factor override
-                status = c.get('eis_status', 'Unknown')
-                if has_zero_factor or score < 50:
-                    status = 'Likely Not Eligible'
-                    status_color = self.RISK_COLOR
-                elif 'Eligible' in status and 'Ineligible' not in status:
-                    status_color = self.ELIGIBLE_COLOR
-                elif 'Review' in status:
-                    status_color = self.REVIEW_COLOR
-                else:
-                    status_color = self.RISK_COLOR
-                
-                # Format sources
-                sources_html = ""
-                if news_sources:
-                    sources_html = f'<div style="margin-top: 8px; font-size: 11px; color: {self.TEXT_SECONDARY};">📰 Sources: {", ".join(news_sources[:2])}</div>'
-                
-                # Truncate summary if too long
-                if news_summary and len(news_summary) > 300:
-                    news_summary = news_summary[:300] + '...'
-                
-                company_news_html += f'''
-                <div style="background: {self.SECTION_BG}; border-left: 4px solid {status_color}; padding: 14px; margin-bottom: 12px; border-radius: 0 6px 6px 0;">
-                    <div style="margin-bottom: 8px;">
-                        <span style="font-weight: 600; color: {self.TEXT_PRIMARY}; font-size: 14px;">{company_name}</span>
-                        <span style="color: {self.TEXT_SECONDARY}; font-size: 12px; margin-left: 8px;">({company_number})</span>
-                        <span style="background: {status_color}; color: white; padding: 2px 8px; border-radius: 4px; font-size: 11px; font-weight: 600; margin-left: 8px;">{score}/100</span>
-                    </div>
-                    <div style="color: {self.TEXT_SECONDARY}; font-size: 12px; margin-bottom: 8px;">
-                        💰 Revenue: {revenue} | 🏢 Sector: {sector} | 📊 Status: <span style="color: {status_color};">{status}</span>
-                    </div>
-                    <div style="color: {self.TEXT_PRIMARY}; font-size: 13px; line-height: 1.6;">
-                        {news_summary if news_summary else 'No recent news available for this company.'}
-                    </div>
-                    {sources_html}
-                </div>
-                '''
-        else:
-            company_news_html = f'''
-            <div style="background: {self.SECTION_BG}; padding: 16px; border-radius: 6px; text-align: center;">
-                <p style="margin: 0; color: {self.TEXT_SECONDARY}; font-size: 13px;">
-                    No AI-generated news available. Add companies to your portfolio and ensure Tavily API is configured.
-                </p>
-            </div>
-            '''
-        
-        # =====================================================================
-        # PORTFOLIO TABLE - Compact company list
-        # =====================================================================
-        portfolio_rows = ""
-        for c in companies[:10]:
-            status = c.get('eis_status', 'Unknown')
-            score = c.get('eis_score', 0)
-            
-            if 'Eligible' in status and 'Ineligible' not in status:
-                status_color = self.ELIGIBLE_COLOR
-            elif 'Review' in status:
-                status_color = self.REVIEW_COLOR
-            else:
-                status_color = self.RISK_COLOR
-            
-            portfolio_rows += f'''
-            <tr>
-                <td style="padding: 8px 10px; border-bottom: 1px solid {self.BORDER_COLOR}; font-size: 13px; color: {self.TEXT_PRIMARY};">
-                    {c.get('company_name', 'Unknown')[:30]}
-                </td>
-                <td style="padding: 8px 10px; border-bottom: 1px solid {self.BORDER_COLOR}; font-size: 13px; color: {self.HEADER_BG}; font-weight: 600; text-align: center;">
-                    {score}/100
-                </td>
-                <td style="padding: 8px 10px; border-bottom: 1px solid {self.BORDER_COLOR}; font-size: 13px; color: {status_color}; text-align: center;">
-                    {status}
-                </td>
-                <td style="padding: 8px 10px; border-bottom: 1px solid {self.BORDER_COLOR}; font-size: 12px; color: {self.TEXT_SECONDARY};">
-                    {c.get('sector', 'N/A')}
-                </td>
-            </tr>
-            '''
-        
-        # =====================================================================
-        # BUILD COMPLETE EMAIL - Clean, minimal design
-        # =====================================================================
-        return f'''<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>EIS Portfolio Intelligence</title>
-</head>
-<body style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Arial, sans-serif; 
-             background-color: #f8fafc; margin: 0; padding: 20px; color: {self.TEXT_PRIMARY}; line-height: 1.5;">
-    
-    <table cellpadding="0" cellspacing="0" border="0" width="100%" style="max-width: 640px; margin: 0 auto; background: white; border-radius: 8px; box-shadow: 0 1px 3px rgba(0,0,0,0.1);">
-        <tr>
-            <td>
-                <!-- Header -->
-                <table cellpadding="0" cellspacing="0" border="0" width="100%" 
-                       style="background: {self.HEADER_BG}; border-radius: 8px 8px 0 0;">
-                    <tr>
-                        <td style="padding: 24px 30px;">
-                            <h1 style="color: white; margin: 0; font-size: 20px; font-weight: 600;">
-                                EIS Portfolio Intelligence
-                            </h1>
-                            <p style="color: rgba(255,255,255,0.8); margin: 6px 0 0 0; font-size: 13px;">
-                                {frequency} Snapshot — Week of {date_display}
-                            </p>
-                        </td>
-                    </tr>
-                </table>
-                
-                <!-- Intro -->
-                <table cellpadding="0" cellspacing="0" border="0" width="100%">
-                    <tr>
-                        <td style="padding: 24px 30px 16px 30px;">
-                            <p style="margin: 0; color: {self.TEXT_PRIMARY}; font-size: 14px;">
-                                Hi team,
-                            </p>
-                            <p style="margin: 12px 0 0 0; color: {self.TEXT_SECONDARY}; font-size: 14px;">
-                                Here is this period's automated EIS monitoring update based on Companies House + enrichment signals.
-                            </p>
-                        </td>
-                    </tr>
-                </table>
-                
-                <!-- PORTFOLIO SUMMARY -->
-                <table cellpadding="0" cellspacing="0" border="0" width="100%">
-                    <tr>
-                        <td style="padding: 0 30px 20px 30px;">
-                            <h2 style="color: {self.HEADER_BG}; margin: 0 0 12px 0; font-size: 15px; font-weight: 600; 
-                                       text-transform: uppercase; letter-spacing: 0.5px; border-bottom: 2px solid {self.HEADER_BG}; padding-bottom: 8px;">
-                                Portfolio Summary
-                            </h2>
-                            <table cellpadding="0" cellspacing="0" border="0" width="100%">
-                                <tr>
-                                    <td style="padding: 4px 0; font-size: 13px; color: {self.TEXT_SECONDARY};">• Companies reviewed:</td>
-                                    <td style="padding: 4px 0; font-size: 13px; color: {self.TEXT_PRIMARY}; font-weight: 600;">{portfolio_count}</td>
-                                </tr>
-                                <tr>
-                                    <td style="padding: 4px 0; font-size: 13px; color: {self.TEXT_SECONDARY};">• Likely eligible (heuristic):</td>
-                                    <td style="padding: 4px 0; font-size: 13px; color: {self.ELIGIBLE_COLOR}; font-weight: 600;">{eligible_count}</td>
-                                </tr>
-                                <tr>
-                                    <td style="padding: 4px 0; font-size: 13px; color: {self.TEXT_SECONDARY};">• Review required:</td>
-                                    <td style="padding: 4px 0; font-size: 13px; color: {self.REVIEW_COLOR}; font-weight: 600;">{review_count}</td>
-                                </tr>
-                                <tr>
-                                    <td style="padding: 4px 0; font-size: 13px; color: {self.TEXT_SECONDARY};">• Likely ineligible:</td>
-                                    <td style="padding: 4px 0; font-size: 13px; color: {self.RISK_COLOR}; font-weight: 600;">{ineligible_count}</td>
-                                </tr>
-                                <tr>
-                                    <td style="padding: 4px 0; font-size: 13px; color: {self.TEXT_SECONDARY};">• Risk flags raised:</td>
-                                    <td style="padding: 4px 0; font-size: 13px; color: {self.TEXT_PRIMARY}; font-weight: 600;">{risk_flag_count}</td>
-                                </tr>
-                            </table>
-                        </td>
-                    </tr>
-                </table>
-                
-                <!-- TOP CHANGES -->
-                <table cellpadding="0" cellspacing="0" border="0" width="100%">
-                    <tr>
-                        <td style="padding: 0 30px 20px 30px;">
-                            <h2 style="color: {self.HEADER_BG}; margin: 0 0 12px 0; font-size: 15px; font-weight: 600; 
-                                       text-transform: uppercase; letter-spacing: 0.5px; border-bottom: 2px solid {self.HEADER_BG}; padding-bottom: 8px;">
-                                Top Changes (This Period)
-                            </h2>
-                            {top_changes_html}
-                        </td>
-                    </tr>
-                </table>
-                
-                <!-- AI COMPANY INTELLIGENCE (Tavily News) -->
-                <table cellpadding="0" cellspacing="0" border="0" width="100%">
-                    <tr>
-                        <td style="padding: 0 30px 20px 30px;">
-                            <h2 style="color: {self.HEADER_BG}; margin: 0 0 4px 0; font-size: 15px; font-weight: 600; 
-                                       text-transform: uppercase; letter-spacing: 0.5px; border-bottom: 2px solid {self.HEADER_BG}; padding-bottom: 8px;">
-                                🤖 AI Company Intelligence
-                            </h2>
-                            <p style="color: {self.TEXT_SECONDARY}; font-size: 12px; margin: 0 0 16px 0; font-style: italic;">
-                                Real-time news research powered by Tavily AI
-                            </p>
-                            {company_news_html}
-                        </td>
-                    </tr>
-                </table>
-                
-                <!-- WATCHLIST -->
-                <table cellpadding="0" cellspacing="0" border="0" width="100%">
-                    <tr>
-                        <td style="padding: 0 30px 20px 30px;">
-                            <h2 style="color: {self.HEADER_BG}; margin: 0 0 12px 0; font-size: 15px; font-weight: 600; 
-                                       text-transform: uppercase; letter-spacing: 0.5px; border-bottom: 2px solid {self.HEADER_BG}; padding-bottom: 8px;">
-                                Watchlist (Review Required)
-                            </h2>
-                            {watchlist_html}
-                        </td>
-                    </tr>
-                </table>
-                
-                <!-- PORTFOLIO TABLE -->
-                <table cellpadding="0" cellspacing="0" border="0" width="100%">
-                    <tr>
-                        <td style="padding: 0 30px 20px 30px;">
-                            <h2 style="color: {self.HEADER_BG}; margin: 0 0 12px 0; font-size: 15px; font-weight: 600; 
-                                       text-transform: uppercase; letter-spacing: 0.5px; border-bottom: 2px solid {self.HEADER_BG}; padding-bottom: 8px;">
-                                Full Portfolio
-                            </h2>
-                            <table cellpadding="0" cellspacing="0" border="0" width="100%" style="border: 1px solid {self.BORDER_COLOR}; border-radius: 6px;">
-                                <tr style="background: {self.SECTION_BG};">
-                                    <th style="padding: 10px; text-align: left; font-size: 11px; color: {self.TEXT_SECONDARY}; text-transform: uppercase; font-weight: 600;">Company</th>
-                                    <th style="padding: 10px; text-align: center; font-size: 11px; color: {self.TEXT_SECONDARY}; text-transform: uppercase; font-weight: 600;">Score</th>
-                                    <th style="padding: 10px; text-align: center; font-size: 11px; color: {self.TEXT_SECONDARY}; text-transform: uppercase; font-weight: 600;">Status</th>
-                                    <th style="padding: 10px; text-align: left; font-size: 11px; color: {self.TEXT_SECONDARY}; text-transform: uppercase; font-weight: 600;">Sector</th>
-                                </tr>
-                                {portfolio_rows}
-                            </table>
-                        </td>
-                    </tr>
-                </table>
-                
-                <!-- DATA SOURCES -->
-                <table cellpadding="0" cellspacing="0" border="0" width="100%">
-                    <tr>
-                        <td style="padding: 0 30px 20px 30px;">
-                            <h2 style="color: {self.HEADER_BG}; margin: 0 0 12px 0; font-size: 15px; font-weight: 600; 
-                                       text-transform: uppercase; letter-spacing: 0.5px; border-bottom: 2px solid {self.HEADER_BG}; padding-bottom: 8px;">
-                                Data Sources Used
-                            </h2>
-                            <p style="margin: 0; color: {self.TEXT_SECONDARY}; font-size: 13px;">
-                                • <strong>Companies House:</strong> profile, officers, PSCs, charges, filing history<br>
-                                • <strong>AI Enrichment:</strong> Tavily search, HuggingFace analysis<br>
-                                • <strong>Note:</strong> EIS "Likely Eligible" is an indicative score — not an official HMRC confirmation.
-                            </p>
-                        </td>
-                    </tr>
-                </table>
-                
-                <!-- NEXT RUN -->
-                <table cellpadding="0" cellspacing="0" border="0" width="100%">
-                    <tr>
-                        <td style="padding: 0 30px 24px 30px;">
-                            <p style="margin: 0; color: {self.TEXT_SECONDARY}; font-size: 13px; font-style: italic;">
-                                Next scheduled run: {next_run_text}
-                            </p>
-                        </td>
-                    </tr>
-                </table>
-                
-                <!-- Footer -->
-                <table cellpadding="0" cellspacing="0" border="0" width="100%" 
-                       style="background: {self.SECTION_BG}; border-radius: 0 0 8px 8px; border-top: 1px solid {self.BORDER_COLOR};">
-                    <tr>
-                        <td style="padding: 20px 30px;">
-                            <p style="margin: 0 0 6px 0; color: {self.TEXT_PRIMARY}; font-size: 13px;">
-                                Regards,<br>
-                                <strong>Sapphire Intelligence</strong> (Automated)
-                            </p>
-                            <p style="margin: 12px 0 0 0; font-size: 11px; color: {self.TEXT_SECONDARY};">
-                                Generated: {timestamp}
-                            </p>
-                        </td>
-                    </tr>
-                </table>
-                
-            </td>
-        </tr>
-    </table>
-</body>
-</html>'''
+        review_companies = kwargs['review_companies']
+        
+        # Watchlist - reasons flagged against the companies needing review.
+        # Each company's flags are lowercased once, then probed for every reason.
+        flag_texts = [str(c.get('risk_flags', [])).lower() for c in review_companies]
+        watchlist_reasons = [
+            reason for reason, probe in _WATCHLIST_PROBES
+            if any(probe in text for text in flag_texts)
+        ]
+        
+        return _HTML_TEMPLATE.render(
+            top_companies=kwargs['top_companies'],
+            spotlight=kwargs['spotlight'],
+            companies_with_news=kwargs['companies_with_news'],  # Tavily-researched news
+            watchlist_count=len(review_companies),
+            watchlist_reasons=watchlist_reasons,
+            portfolio_count=kwargs['portfolio_count'],
+            eligible_count=kwargs['eligible_count'],
+            review_count=kwargs['review_count'],
+            ineligible_count=kwargs['ineligible_count'],
+            risk_flag_count=kwargs['risk_flag_count'],
+            date_display=kwargs['date_display'],
+            timestamp=kwargs['timestamp'],
+            frequency=kwargs['frequency'],
+            next_run_text=kwargs['next_run_text']
+        )
     
     def _generate_plain_text(self, **kwargs) -> str:
         """Generate plain text version for email clients that don't support HTML."""
-        companies = kwargs['companies']
         spotlight = kwargs['spotlight']
         ai_insights = kwargs['ai_insights']
         portfolio_count = kwargs['portfolio_count']
@@ -539,7 +381,7 @@ class ProfessionalNewsletterGenerator:
         date_display = kwargs['date_display']
         timestamp = kwargs['timestamp']
         
-        text = f"""
+        parts = [f"""
 EIS INVESTMENT INTELLIGENCE REPORT
 {'='*50}
 Prepared for: Portfolio Subscribers
@@ -554,29 +396,29 @@ EXECUTIVE SUMMARY
 
 PORTFOLIO OVERVIEW
 {'-'*50}
-"""
-        for c in companies[:10]:
-            text += f"{c.get('company_name', 'Unknown')} | {c.get('eis_score', 0)}/100 | {c.get('eis_status', 'Unknown')} | {c.get('sector', 'N/A')}\n"
+"""]
+        for c in kwargs['top_companies']:
+            parts.append(f"{c.get('company_name', 'Unknown')} | {c.get('eis_score', 0)}/100 | {c.get('eis_status', 'Unknown')} | {c.get('sector', 'N/A')}\n")
         
-        text += f"""
+        parts.append(f"""
 TOP COMPANY SPOTLIGHT
 {'-'*50}
-"""
+""")
         for c in spotlight:
-            text += f"""
+            parts.append(f"""
 {c.get('company_name', 'Unknown')} - {c.get('eis_score', 0)}/100 ({c.get('eis_status', 'Unknown')})
 Sector: {c.get('sector', 'N/A')}
 {c.get('news_summary', c.get('narrative', 'No recent updates available.'))}
-"""
+""")
         
-        text += f"""
+        parts.append(f"""
 AI MARKET INSIGHTS
 {'-'*50}
-"""
+""")
         for insight in (ai_insights[:3] if ai_insights else ['EIS qualifying trade requirements remain focused on growth-oriented activities', 'Technology and healthcare sectors continue to show strong EIS eligibility patterns', 'Recent HMRC guidance emphasizes importance of 7-year trading age threshold']):
-            text += f"- {insight}\n"
+            parts.append(f"- {insight}\n")
         
-        text += f"""
+        parts.append(f"""
 ACTION SUMMARY
 {'-'*50}
 This report enables rapid screening and prioritisation of EIS investment candidates.
@@ -587,50 +429,288 @@ Companies flagged under Risk Watch should undergo manual review or HMRC Advance
 Data Sources: Companies House, HMRC EIS Guidance, Extracted Statutory Filings, AI-Assisted Analysis
 Generated by: EIS Investment Scanner - Sapphire Intelligence Platform
 Timestamp: {timestamp}
-"""
-        return text
+""")
+        return "".join(parts)
+    
+    def _connect(self) -> "smtplib.SMTP_SSL":
+        """Open an authenticated Gmail SMTP session."""
+        import smtplib
+        server = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT, context=_ssl_context())
+        server.login(self.gmail_address, self.gmail_password)
+        return server
+    
+    def _checkout(self) -> tuple:
+        """
+        Take an idle pooled session that still answers NOOP, or open a new one.
+        
+        Returns:
+            (server, messages already sent on it)
+        """
+        import smtplib
+        
+        while True:
+            with _SMTP_POOL_LOCK:
+                idle = _SMTP_POOL.get(self.gmail_address)
+                if not idle:
+                    break
+                server, used = idle.pop()
+            try:
+                if server.noop()[0] == 250:
+                    return server, used
+            except (smtplib.SMTPException, OSError):
+                # Dead or timed-out socket: drop it without waiting on a QUIT reply
+                server.close()
+                continue
+            self._disconnect(server)
+        
+        return self._connect(), 0
     
-    def send_newsletter(self, newsletter_data: Dict, recipients: List[str], test_mode: bool = False) -> Dict:
-        """Send newsletter to recipients."""
+    def _checkin(self, server: Optional["smtplib.SMTP_SSL"], used: int, limit: int) -> None:
+        """Return a session to the pool, or close it if it is spent or the pool is full."""
+        if server is None:
+            return
+        if used < limit:
+            with _SMTP_POOL_LOCK:
+                idle = _SMTP_POOL.setdefault(self.gmail_address, [])
+                if len(idle) < SMTP_CONCURRENCY:
+                    idle.append((server, used))
+                    return
+        self._disconnect(server)
+    
+    def _send_on(self, server: "smtplib.SMTP_SSL", recipient: str, payload: bytes) -> None:
+        """Send prepared wire bytes over an already open session (SMTPUTF8 for non-ASCII addresses)."""
+        mail_options = () if recipient.isascii() else ('SMTPUTF8',)
+        server.sendmail(self.gmail_address, [recipient], payload, mail_options)
+    
+    @staticmethod
+    def _disconnect(server: Optional["smtplib.SMTP_SSL"]) -> None:
+        """Close an SMTP session, ignoring errors from an already dropped connection."""
+        if server is None:
+            return
+        import smtplib
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+    
+    def _send_with_retry(self, server: "smtplib.SMTP_SSL", used: int, recipient: str,
+                         payload: bytes) -> tuple:
+        """
+        Send a message, reconnecting with exponential backoff on dropped
+        sessions and transient 421/450 replies.
+        
+        Returns (session, messages sent on it) after the send. A failure is
+        re-raised with the session the caller should carry on with attached
+        as `smtp_session` - (None, 0) when it was closed - so a session
+        opened by a retry is never lost and a closed one is never reused.
+        """
+        import smtplib
+        
+        attempt = 0
+        try:
+            while True:
+                try:
+                    self._send_on(server, recipient, payload)
+                    return server, used + 1
+                except (smtplib.SMTPServerDisconnected, smtplib.SMTPResponseException) as e:
+                    transient = (
+                        isinstance(e, smtplib.SMTPServerDisconnected)
+                        or e.smtp_code in SMTP_RETRY_CODES
+                    )
+                    if not transient or attempt == SMTP_MAX_RETRIES:
+                        raise
+                time.sleep(SMTP_RETRY_BACKOFF * 2 ** attempt)
+                attempt += 1
+                self._disconnect(server)
+                server, used = None, 0
+                server = self._connect()
+        except Exception as e:
+            # A refused recipient or permanent reply leaves the session usable;
+            # anything else (exhausted retries, failed reconnect) retires it
+            usable = isinstance(e, smtplib.SMTPRecipientsRefused) or (
+                isinstance(e, smtplib.SMTPResponseException)
+                and e.smtp_code not in SMTP_RETRY_CODES
+            )
+            if server is not None and not usable:
+                self._disconnect(server)
+                server, used = None, 0
+            e.smtp_session = (server, used)
+            raise
+    
+    def _build_message(self, content: Dict[str, str], recipient: Optional[str] = None) -> bytes:
+        """
+        Serialize the newsletter to SMTP wire bytes.
+        
+        Only the To header differs between recipients, so by default the
+        message is generated once with a placeholder recipient that each send
+        patches in the raw bytes, skipping MIME re-serialization per recipient.
+        Non-ASCII addresses cannot be patched into those bytes; passing
+        `recipient` builds a message for that address alone, with UTF-8
+        headers for an SMTPUTF8 send.
+        """
+        from email.message import EmailMessage
+        from email.policy import SMTP as SMTP_POLICY
+        
+        msg = EmailMessage()
+        msg['Subject'] = content['subject']
+        msg['From'] = f"EIS Intelligence <{self.gmail_address}>"
+        msg['To'] = recipient or RCPT_PLACEHOLDER.decode('ascii')
+        msg.set_content(content['plain_text'])
+        msg.add_alternative(content['html'], subtype='html')
+        return msg.as_bytes(policy=SMTP_POLICY if recipient is None else SMTP_POLICY.clone(utf8=True))
+    
+    def _send_batch(self, message: "Future[tuple]", batch: List[str], batch_size: int,
+                    totals: Dict[str, int], lock: threading.Lock) -> None:
+        """
+        Deliver one batch of recipients over a single SMTP session.
+        
+        The session comes from the idle pool when one is available and goes
+        back to it afterwards, so repeated sends skip the TLS handshake and
+        login. A session is retired once it has carried batch_size messages.
+        
+        The session is opened before waiting on `message` (the rendered
+        content and its placeholder wire bytes), so connecting overlaps with
+        the caller rendering the newsletter.
+        """
+        server = None
+        used = 0
+        
+        try:
+            try:
+                server, used = self._checkout()
+            except Exception as e:
+                logger.warning("Could not open SMTP session ahead of rendering: %s", e)
+            
+            base_bytes, content = message.result()
+            
+            for recipient in batch:
+                try:
+                    if recipient.isascii():
+                        payload = base_bytes.replace(RCPT_PLACEHOLDER, recipient.encode('ascii'), 1)
+                    else:
+                        payload = self._build_message(content, recipient)
+                    
+                    if server is None:
+                        server, used = self._checkout()
+                    elif used >= batch_size:
+                        self._disconnect(server)
+                        server = None
+                        server, used = self._connect(), 0
+                    
+                    server, used = self._send_with_retry(server, used, recipient, payload)
+                    logger.debug("Sent newsletter to: %s", recipient)
+                    delivered = True
+                    
+                except Exception as e:
+                    if hasattr(e, 'smtp_session'):
+                        server, used = e.smtp_session
+                    logger.error("Failed to send to %s: %s", recipient, e)
+                    delivered = False
+                
+                with lock:
+                    totals['sent' if delivered else 'failed'] += 1
+        finally:
+            self._checkin(server, used, batch_size)
+    
+    def send_newsletter(self, newsletter_data: Dict, recipients: List[str], test_mode: bool = False,
+                        concurrency: int = SMTP_CONCURRENCY, batch_size: int = SMTP_BATCH_SIZE) -> Dict:
+        """
+        Send newsletter to recipients.
+        
+        Recipients are split into batches of `batch_size`, each delivered over
+        its own SMTP session, with up to `concurrency` batches in flight.
+        """
         if not self.gmail_address or not self.gmail_password:
             logger.error("Gmail credentials not configured")
             return {"sent": 0, "failed": len(recipients), "error": "Gmail not configured"}
         
-        # Generate newsletter content
-        content = self.generate_newsletter(newsletter_data)
+        valid = [r for r in recipients if _EMAIL_RE.fullmatch(r)]
+        skipped = len(recipients) - len(valid)
+        if skipped:
+            logger.warning("Skipping %d invalid recipient address(es)", skipped)
+        recipients = valid
         
-        sent = 0
-        failed = 0
+        if not recipients:
+            return {"sent": 0, "failed": skipped, "subject": None}
         
-        for recipient in recipients:
-            if test_mode:
-                logger.info(f"[TEST MODE] Would send to: {recipient}")
-                sent += 1
-                continue
+        if test_mode:
+            # Dry runs only need the subject line, so skip rendering the body
+            subject = self.generate_subject({
+                'portfolio_count': len(newsletter_data.get('companies', [])),
+                'frequency': newsletter_data.get('frequency', 'Weekly')
+            })
+            if logger.isEnabledFor(logging.DEBUG):
+                for recipient in recipients:
+                    logger.debug("[TEST MODE] Would send to: %s", recipient)
+            logger.info("[TEST MODE] Would send '%s' to %d recipients", subject, len(recipients))
+            return {"sent": len(recipients), "failed": skipped, "subject": subject}
+        
+        batch_size = max(1, batch_size)
+        batches = [recipients[i:i + batch_size] for i in range(0, len(recipients), batch_size)]
+        
+        totals = {"sent": 0, "failed": 0}
+        lock = threading.Lock()
+        workers = max(1, min(concurrency, len(batches)))
+        
+        from concurrent.futures import Future, ThreadPoolExecutor
+        
+        message: "Future[tuple]" = Future()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._send_batch, message, batch, batch_size, totals, lock)
+                for batch in batches
+            ]
             
+            # Render while the workers are connecting
             try:
-                msg = MIMEMultipart('alternative')
-                msg['Subject'] = content['subject']
-                msg['From'] = f"EIS Intelligence <{self.gmail_address}>"
-                msg['To'] = recipient
-                
-                # Attach plain text and HTML versions
-                msg.attach(MIMEText(content['plain_text'], 'plain'))
-                msg.attach(MIMEText(content['html'], 'html'))
-                
-                # Send via Gmail SMTP
-                with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
-                    server.login(self.gmail_address, self.gmail_password)
-                    server.send_message(msg)
-                
-                logger.info(f"Sent newsletter to: {recipient}")
-                sent += 1
-                
+                content = self.generate_newsletter(newsletter_data)
+                message.set_result((self._build_message(content), content))
             except Exception as e:
-                logger.error(f"Failed to send to {recipient}: {e}")
-                failed += 1
+                message.set_exception(e)
+                raise
+            
+            for future in futures:
+                future.result()
         
-        return {"sent": sent, "failed": failed, "subject": content['subject']}
+        logger.info("Newsletter send complete: sent=%d failed=%d", totals['sent'], totals['failed'] + skipped)
+        return {"sent": totals['sent'], "failed": totals['failed'] + skipped, "subject": content['subject']}
+
+
+# Shared Jinja2 environment; the newsletter template is compiled once at import,
+# and the bytecode cache (under the system temp dir) lets new worker processes
+# skip compiling it at all
+_ENV = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    bytecode_cache=FileSystemBytecodeCache(),
+    autoescape=select_autoescape(['html']),
+    trim_blocks=True,
+    lstrip_blocks=True,
+    auto_reload=False
+)
+_ENV.filters.update(
+    effective_status=ProfessionalNewsletterGenerator._effective_status,
+    status_color=ProfessionalNewsletterGenerator._status_color,
+    recommendation=ProfessionalNewsletterGenerator._recommendation,
+    truncate_text=ProfessionalNewsletterGenerator._truncate,
+    revenue=ProfessionalNewsletterGenerator._revenue
+)
+# The color scheme never changes between sends, so bind it once as template globals
+_ENV.globals.update({
+    name: getattr(ProfessionalNewsletterGenerator, name)
+    for name in ('HEADER_BG', 'SECTION_BG', 'TEXT_PRIMARY', 'TEXT_SECONDARY',
+                 'BORDER_COLOR', 'ELIGIBLE_COLOR', 'REVIEW_COLOR', 'RISK_COLOR')
+})
+_HTML_TEMPLATE = _ENV.get_template('professional_newsletter.html')
+
+
+@atexit.register
+def _close_smtp_pool() -> None:
+    """QUIT every idle pooled session when the process exits."""
+    with _SMTP_POOL_LOCK:
+        sessions = [server for idle in _SMTP_POOL.values() for server, _ in idle]
+        _SMTP_POOL.clear()
+    for server in sessions:
+        ProfessionalNewsletterGenerator._disconnect(server)
 
 
 # Backward compatibility with existing EISMailer interface
@@ -640,14 +720,102 @@ class EISMailer:
     def __init__(self, gmail_address: str = None, gmail_password: str = None, subscribers_file: str = None):
         self.generator = ProfessionalNewsletterGenerator(gmail_address, gmail_password)
         self.subscribers_file = Path(subscribers_file) if subscribers_file else SUBSCRIBERS_FILE
+        # (st_mtime_ns, file data, subscribers as insertion-ordered dict keys)
+        self._subs_cache: Optional[tuple] = None
+        self._subs_dirty = False  # In-memory changes not yet written by flush_subscribers()
+    
+    def _refresh_subscribers(self) -> None:
+        """Reload subscribers.json into the cache if it changed on disk."""
+        if self._subs_dirty:
+            return  # Pending in-memory changes win until flushed
+        try:
+            mtime = self.subscribers_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._subs_cache = (None, {'subscribers': []}, {})
+            return
+        
+        if self._subs_cache is None or self._subs_cache[0] != mtime:
+            data = _read_json_file(self.subscribers_file)
+            self._subs_cache = (mtime, data, dict.fromkeys(data.get('subscribers', [])))
     
     def load_subscribers(self) -> List[str]:
-        if not self.subscribers_file.exists():
-            return []
-        with open(self.subscribers_file, 'r') as f:
-            return json.load(f).get('subscribers', [])
+        """Load subscriber emails, re-reading the file only when its mtime changes."""
+        self._refresh_subscribers()
+        return list(self._subs_cache[2])
+    
+    def save_subscribers(self, data: Dict) -> None:
+        """
+        Write the subscribers file, keeping the API's extra keys (frequencies, notes).
+        
+        The data goes to a temp file first and is swapped in with os.replace,
+        so a crash mid-write never leaves a truncated subscribers.json.
+        """
+        data['updated'] = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        tmp = self.subscribers_file.with_suffix('.json.tmp')
+        tmp.write_bytes(_json_dumps(data))
+        os.replace(tmp, self.subscribers_file)
+        self._subs_dirty = False
+        self._subs_cache = (
+            self.subscribers_file.stat().st_mtime_ns,
+            data,
+            dict.fromkeys(data.get('subscribers', []))
+        )
+    
+    def flush_subscribers(self) -> None:
+        """Write pending subscriber changes to disk, if there are any."""
+        if self._subs_dirty:
+            _, data, members = self._subs_cache
+            data['subscribers'] = list(members)
+            self.save_subscribers(data)
+    
+    def add_subscriber(self, emails: Union[str, Iterable[str]], flush: bool = True) -> int:
+        """
+        Add one or more subscribers.
+        
+        A bulk import writes the file once rather than once per address. Pass
+        flush=False to defer the write until flush_subscribers() is called.
+        
+        Returns:
+            Number of addresses added (0 if all were invalid or already subscribed)
+        """
+        if isinstance(emails, str):
+            emails = (emails,)
+        
+        self._refresh_subscribers()
+        members = self._subs_cache[2]
+        
+        added = 0
+        for email in emails:
+            if _EMAIL_RE.fullmatch(email) is None:
+                logger.warning("Rejected invalid email address: %s", email)
+                continue
+            if email in members:
+                continue
+            members[email] = None
+            added += 1
+            logger.info("Added subscriber: %s", email)
+        
+        if added:
+            self._subs_dirty = True
+            if flush:
+                self.flush_subscribers()
+        return added
     
-    def send_newsletter(self, newsletter: Dict, recipients: List[str], test_mode: bool = False) -> Dict:
+    def remove_subscriber(self, email: str) -> bool:
+        """Remove a subscriber. The file is only rewritten if the address was present."""
+        self._refresh_subscribers()
+        members = self._subs_cache[2]
+        if email not in members:
+            return False
+        
+        del members[email]
+        self._subs_dirty = True
+        self.flush_subscribers()
+        logger.info("Removed subscriber: %s", email)
+        return True
+    
+    def send_newsletter(self, newsletter: Dict, recipients: List[str], test_mode: bool = False,
+                        concurrency: int = SMTP_CONCURRENCY, batch_size: int = SMTP_BATCH_SIZE) -> Dict:
         # Convert old format to new format
         companies = newsletter.get('deal_highlights', [])
         
@@ -660,4 +828,74 @@ class EISMailer:
             'frequency': 'Weekly'
         }
         
-        return self.generator.send_newsletter(data, recipients, test_mode)
+        return self.generator.send_newsletter(data, recipients, test_mode,
+                                              concurrency=concurrency, batch_size=batch_size)
+
+
+def main():
+    """Command-line interface for subscriber management."""
+    parser = argparse.ArgumentParser(
+        description='Manage EIS newsletter subscribers'
+    )
+    parser.add_argument(
+        '--add-subscriber', metavar='EMAIL', nargs='+',
+        help='Add one or more email addresses to the subscriber list'
+    )
+    parser.add_argument(
+        '--remove-subscriber', metavar='EMAIL',
+        help='Remove an email address from the subscriber list'
+    )
+    parser.add_argument(
+        '--list-subscribers', action='store_true',
+        help='Print the current subscriber list'
+    )
+    parser.add_argument(
+        '--send', metavar='NEWSLETTER_JSON',
+        help='Send a newsletter JSON file to all subscribers'
+    )
+    parser.add_argument(
+        '--test-mode', action='store_true',
+        help='With --send, log recipients instead of sending'
+    )
+    parser.add_argument(
+        '--concurrency', type=int, default=SMTP_CONCURRENCY,
+        help=f'With --send, number of SMTP sessions in parallel (default: {SMTP_CONCURRENCY})'
+    )
+    parser.add_argument(
+        '--batch-size', type=int, default=SMTP_BATCH_SIZE,
+        help=f'With --send, messages per SMTP session (default: {SMTP_BATCH_SIZE})'
+    )
+    
+    args = parser.parse_args()
+    mailer = EISMailer()
+    
+    if args.add_subscriber:
+        added = mailer.add_subscriber(args.add_subscriber)
+        print(f"Added {added} of {len(args.add_subscriber)} address(es)")
+    
+    if args.remove_subscriber:
+        if mailer.remove_subscriber(args.remove_subscriber):
+            print(f"Removed {args.remove_subscriber}")
+        else:
+            print(f"{args.remove_subscriber} not found")
+    
+    if args.list_subscribers:
+        subscribers = mailer.load_subscribers()
+        print(f"{len(subscribers)} subscriber(s):")
+        for email in subscribers:
+            print(f"  {email}")
+    
+    if args.send:
+        try:
+            newsletter = _read_json_file(Path(args.send))
+        except (OSError, ValueError) as e:
+            parser.error(f"Cannot load newsletter: {e}")
+        result = mailer.send_newsletter(
+            newsletter, mailer.load_subscribers(), test_mode=args.test_mode,
+            concurrency=args.concurrency, batch_size=args.batch_size
+        )
+        print(f"Sent: {result['sent']}, failed: {result['failed']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,272 +8,167 @@ Version: 1.0
 """
 
 import os
+import json
+import hashlib
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime
 import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
 
 logger = logging.getLogger(__name__)
 
+TEMPLATE_DIR = Path(__file__).parent.parent / "templates"
+
+# Rendered PDFs keyed by report content; oldest-used files are evicted past the limit
+PDF_CACHE_DIR = Path(__file__).parent / "output" / "pdf_cache"
+PDF_CACHE_MAX_FILES = 200
+
+# write_pdf size options (WeasyPrint >= 59): subset fonts without hinting
+# tables, losslessly recompress images, keep streams compressed
+PDF_WRITE_OPTIONS = {
+    'optimize_images': True,
+    'full_fonts': False,
+    'hinting': False,
+    'uncompressed_pdf': False,
+    'pdf_version': '1.7'
+}
+
+# The report template is compiled once at import (bytecode cached on disk for
+# new worker processes); autoescaping covers the scraped news and references
+_ENV = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    bytecode_cache=FileSystemBytecodeCache(),
+    autoescape=select_autoescape(['html']),
+    trim_blocks=True,
+    lstrip_blocks=True,
+    auto_reload=False
+)
+_REPORT_TEMPLATE = _ENV.get_template('research_report.html')
+
+# Folded into cache keys so PDFs cached before a template, style or output
+# option change are not reused
+_TEMPLATE_DIGEST = hashlib.blake2b(
+    b''.join((TEMPLATE_DIR / name).read_bytes() for name in ('research_report.html', 'research_report.css'))
+    + repr(sorted(PDF_WRITE_OPTIONS.items())).encode('utf-8'),
+    digest_size=8
+).digest()
 
-def generate_report_html(report: Dict) -> str:
-    """Generate HTML for the research report."""
+
+@lru_cache(maxsize=256)
+def _fmt_date(iso: str) -> str:
+    """Display date for an ISO timestamp; reports from one run share a timestamp."""
+    return datetime.fromisoformat(iso).strftime('%B %d, %Y')
+
+
+@lru_cache(maxsize=1)
+def _pdf_stylesheet():
+    """
+    Report stylesheet parsed once by WeasyPrint, with the font configuration
+    it was built against; reusing both skips CSS parsing and font discovery
+    on every PDF.
+    """
+    from weasyprint import CSS
+    from weasyprint.text.fonts import FontConfiguration
     
-    company_name = report.get("company_name", "Company")
-    company_overview = report.get("company_overview", {})
-    industry_overview = report.get("industry_overview", {})
-    financial_overview = report.get("financial_overview", {})
-    news = report.get("news", [])
-    references = report.get("references", [])
+    font_config = FontConfiguration()
+    css = CSS(string=(TEMPLATE_DIR / 'research_report.css').read_text(encoding='utf-8'),
+              font_config=font_config)
+    return css, font_config
+
+
+def _report_context(report: Dict) -> Dict[str, Any]:
+    """Template fields for one report, with the defaults for missing sections."""
     generated_at = report.get("generated_at", datetime.now().isoformat())
     
-    # Format news items
-    news_html = ""
-    for item in news[:10]:
-        news_html += f"""
-        <div class="news-item">
-            <h4>{item.get('title', 'News')}</h4>
-            <p>{item.get('content', '')[:300]}...</p>
-        </div>
-        """
-    
-    # Format references
-    refs_html = "<ul class='references'>"
-    for ref in references[:15]:
-        refs_html += f"""<li><a href="{ref.get('url', '#')}">{ref.get('title', 'Source')}</a></li>"""
-    refs_html += "</ul>"
-    
-    html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="UTF-8">
-        <title>{company_name} Research Report</title>
-        <style>
-            @page {{
-                size: A4;
-                margin: 2cm;
-            }}
-            
-            body {{
-                font-family: 'Segoe UI', Arial, sans-serif;
-                font-size: 11pt;
-                line-height: 1.6;
-                color: #1e293b;
-                background: white;
-            }}
-            
-            .header {{
-                background: linear-gradient(135deg, #1e3a5f 0%, #4f46e5 100%);
-                color: white;
-                padding: 30px;
-                margin: -2cm -2cm 30px -2cm;
-                text-align: center;
-            }}
-            
-            .header h1 {{
-                margin: 0;
-                font-size: 28pt;
-                font-weight: 700;
-            }}
-            
-            .header .subtitle {{
-                margin-top: 10px;
-                font-size: 12pt;
-                opacity: 0.9;
-            }}
-            
-            .header .meta {{
-                margin-top: 15px;
-                font-size: 10pt;
-                opacity: 0.7;
-            }}
-            
-            h2 {{
-                color: #1e3a5f;
-                font-size: 16pt;
-                border-bottom: 2px solid #1e3a5f;
-                padding-bottom: 8px;
-                margin-top: 30px;
-            }}
-            
-            h3 {{
-                color: #4f46e5;
-                font-size: 13pt;
-                margin-top: 20px;
-            }}
-            
-            h4 {{
-                color: #334155;
-                font-size: 11pt;
-                margin: 15px 0 8px 0;
-            }}
-            
-            p {{
-                margin: 10px 0;
-                text-align: justify;
-            }}
-            
-            .section {{
-                margin-bottom: 25px;
-                page-break-inside: avoid;
-            }}
-            
-            .highlight-box {{
-                background: #f1f5f9;
-                border-left: 4px solid #4f46e5;
-                padding: 15px;
-                margin: 15px 0;
-            }}
-            
-            .news-item {{
-                background: #fafafa;
-                border: 1px solid #e2e8f0;
-                border-radius: 8px;
-                padding: 15px;
-                margin: 10px 0;
-            }}
-            
-            .news-item h4 {{
-                margin: 0 0 8px 0;
-                color: #1e293b;
-            }}
-            
-            .news-item p {{
-                margin: 0;
-                font-size: 10pt;
-                color: #64748b;
-            }}
-            
-            .references {{
-                font-size: 9pt;
-                color: #64748b;
-            }}
-            
-            .references li {{
-                margin: 5px 0;
-            }}
-            
-            .references a {{
-                color: #4f46e5;
-                text-decoration: none;
-            }}
-            
-            .footer {{
-                margin-top: 40px;
-                padding-top: 20px;
-                border-top: 1px solid #e2e8f0;
-                font-size: 9pt;
-                color: #94a3b8;
-                text-align: center;
-            }}
-            
-            .badge {{
-                display: inline-block;
-                background: #4f46e5;
-                color: white;
-                padding: 3px 10px;
-                border-radius: 12px;
-                font-size: 9pt;
-                margin-right: 5px;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <h1>{company_name} Research Report</h1>
-            <div class="subtitle">Comprehensive Company Analysis</div>
-            <div class="meta">
-                Generated: {datetime.fromisoformat(generated_at).strftime('%B %d, %Y')} | 
-                Powered by Sapphire Intelligence Platform
-            </div>
-        </div>
-        
-        <div class="section">
-            <h2>Company Overview</h2>
-            
-            <h3>Business Description</h3>
-            <p>{company_overview.get('business_description', 'No data available.')}</p>
-            
-            <h3>Leadership Team</h3>
-            <p>{company_overview.get('leadership_team', 'Leadership information not available.')}</p>
-            
-            <h3>Target Market</h3>
-            <p>{company_overview.get('target_market', 'Market information not available.')}</p>
-            
-            <h3>Key Differentiators</h3>
-            <p>{company_overview.get('key_differentiators', 'Differentiator information not available.')}</p>
-            
-            <h3>Business Model</h3>
-            <p>{company_overview.get('business_model', 'Business model information not available.')}</p>
-        </div>
-        
-        <div class="section">
-            <h2>Industry Overview</h2>
-            
-            <h3>Market Landscape</h3>
-            <p>{industry_overview.get('market_landscape', 'Industry analysis pending.')}</p>
-            
-            <h3>Competition</h3>
-            <p>{industry_overview.get('competition', 'Competition analysis not available.')}</p>
-            
-            <h3>Competitive Advantages</h3>
-            <p>{industry_overview.get('competitive_advantages', 'Competitive advantages not identified.')}</p>
-            
-            <h3>Market Challenges</h3>
-            <p>{industry_overview.get('market_challenges', 'Market challenges not identified.')}</p>
-        </div>
-        
-        <div class="section">
-            <h2>Financial Overview</h2>
-            
-            <h3>Funding & Investment</h3>
-            <p>{financial_overview.get('funding_investment', 'Funding information not available.')}</p>
-            
-            <h3>Revenue Model</h3>
-            <p>{financial_overview.get('revenue_model', 'Revenue model not identified.')}</p>
-            
-            <h3>Financial Milestones</h3>
-            <p>{financial_overview.get('financial_milestones', 'Financial milestones not available.')}</p>
-        </div>
-        
-        <div class="section">
-            <h2>Recent News</h2>
-            {news_html if news_html else "<p>No recent news available.</p>"}
-        </div>
-        
-        <div class="section">
-            <h2>References</h2>
-            {refs_html}
-        </div>
-        
-        <div class="footer">
-            <p>This report was generated by Sapphire Intelligence Platform using Tavily AI research.</p>
-            <p>For EIS investment analysis, please use the dedicated EIS Investment Scanner.</p>
-        </div>
-    </body>
-    </html>
+    return {
+        "company_name": report.get("company_name", "Company"),
+        "company_overview": report.get("company_overview", {}),
+        "industry_overview": report.get("industry_overview", {}),
+        "financial_overview": report.get("financial_overview", {}),
+        "news": report.get("news", []),
+        "references": report.get("references", []),
+        "generated_date": _fmt_date(generated_at)
+    }
+
+
+def generate_report_html(report: Dict, inline_styles: bool = True) -> str:
     """
+    Generate HTML for the research report.
     
-    return html
+    inline_styles=False leaves out the <style> block, for callers that
+    supply the stylesheet separately (generate_pdf).
+    """
+    return _REPORT_TEMPLATE.render(**_report_context(report), inline_styles=inline_styles)
 
 
-def generate_pdf(report: Dict) -> bytes:
+def _pdf_cache_key(report: Dict) -> str:
+    """Stable digest of what a report renders to (fields, display date, template and options)."""
+    raw = json.dumps(_report_context(report), default=str, sort_keys=True).encode('utf-8')
+    return hashlib.blake2b(raw, key=_TEMPLATE_DIGEST, digest_size=16).hexdigest()
+
+
+def _read_cached_pdf(key: str) -> Optional[bytes]:
+    path = PDF_CACHE_DIR / f"{key}.pdf"
+    try:
+        pdf_bytes = path.read_bytes()
+        os.utime(path)  # mark as recently used for eviction
+        return pdf_bytes
+    except OSError:
+        return None
+
+
+def _write_cached_pdf(key: str, pdf_bytes: bytes) -> None:
+    """Store a rendered PDF, then trim the cache to PDF_CACHE_MAX_FILES."""
+    try:
+        PDF_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = PDF_CACHE_DIR / f"{key}.pdf"
+        # Server processes can finish the same report at once, so write a
+        # per-process temp file and swap it in
+        tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp.write_bytes(pdf_bytes)
+        os.replace(tmp, path)
+        
+        cached = list(PDF_CACHE_DIR.glob('*.pdf'))
+        if len(cached) > PDF_CACHE_MAX_FILES:
+            cached.sort(key=lambda p: p.stat().st_mtime)
+            for stale in cached[:len(cached) - PDF_CACHE_MAX_FILES]:
+                stale.unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning(f"Could not cache PDF: {e}")
+
+
+def generate_pdf(report: Dict, use_cache: bool = True) -> bytes:
     """
     Generate PDF from research report.
     
+    Reports that render identically to a recent one are served from the
+    on-disk cache (PDF_CACHE_DIR) without invoking WeasyPrint.
+    
     Returns PDF as bytes.
     """
+    key = _pdf_cache_key(report) if use_cache else None
+    if key:
+        pdf_bytes = _read_cached_pdf(key)
+        if pdf_bytes is not None:
+            logger.info(f"PDF served from cache: {len(pdf_bytes)} bytes")
+            return pdf_bytes
+    
     try:
         from weasyprint import HTML
         
-        html_content = generate_report_html(report)
+        html_content = generate_report_html(report, inline_styles=False)
+        stylesheet, font_config = _pdf_stylesheet()
         
         # Generate PDF
-        pdf_bytes = HTML(string=html_content).write_pdf()
+        pdf_bytes = HTML(string=html_content).write_pdf(
+            stylesheets=[stylesheet], font_config=font_config, **PDF_WRITE_OPTIONS
+        )
         
         logger.info(f"PDF generated: {len(pdf_bytes)} bytes")
-        return pdf_bytes
         
     except ImportError:
         logger.error("WeasyPrint not installed. Run: pip install weasyprint")
@@ -281,6 +176,10 @@ def generate_pdf(report: Dict) -> bytes:
     except Exception as e:
         logger.error(f"PDF generation failed: {e}")
         raise
+    
+    if key:
+        _write_cached_pdf(key, pdf_bytes)
+    return pdf_bytes
 
 
 def save_pdf(report: Dict, output_path: str) -> str:
@@ -25,6 +25,7 @@ import sys
 import json
 import logging
 import argparse
+from logging.handlers import MemoryHandler
 from datetime import datetime
 from typing import Dict, List, Any
 from pathlib import Path
@@ -36,18 +37,30 @@ from automation.scanner import EISScanner
 from automation.writer import EISWriter
 from automation.mailer import EISMailer
 
-# Configure logging
+# Configure logging. force=True because the imported modules call basicConfig
+# first. File output is buffered and written in batches (or as soon as an
+# error is logged); the log file is only opened on first flush.
+_LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+_file_handler = logging.FileHandler(Path(__file__).parent / 'newsletter.log', delay=True)
+_file_handler.setFormatter(logging.Formatter(_LOG_FORMAT))
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    format=_LOG_FORMAT,
     handlers=[
         logging.StreamHandler(),
-        logging.FileHandler(Path(__file__).parent / 'newsletter.log')
-    ]
+        MemoryHandler(capacity=512, flushLevel=logging.ERROR, target=_file_handler)
+    ],
+    force=True
 )
 logger = logging.getLogger(__name__)
 
 
+def _log_phase(title: str) -> None:
+    """Log a phase banner; skipped entirely when INFO is disabled."""
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("%s\n%s\n%s", "=" * 70, title, "=" * 70)
+
+
 def run_pipeline(
     days: int = 7,
     min_score: int = 50,
@@ -55,7 +68,8 @@ def run_pipeline(
     use_ai: bool = False,
     dry_run: bool = False,
     scan_only: bool = False,
-    output_dir: str = "output"
+    output_dir: str = "output",
+    concurrency: int = 5
 ) -> Dict[str, Any]:
     """
     Run the complete EIS newsletter pipeline.
@@ -68,6 +82,7 @@ def run_pipeline(
         dry_run: Preview mode, don't actually send emails
         scan_only: Only run scanner, skip writer and mailer
         output_dir: Directory for output files
+        concurrency: Number of parallel SMTP sessions used by the mailer
     
     Returns:
         Pipeline execution results
@@ -87,9 +102,7 @@ def run_pipeline(
         # =====================================================================
         # PHASE 1: SCANNER
         # =====================================================================
-        logger.info("=" * 70)
-        logger.info("PHASE 1: SCANNING FOR EIS-ELIGIBLE COMPANIES")
-        logger.info("=" * 70)
+        _log_phase("PHASE 1: SCANNING FOR EIS-ELIGIBLE COMPANIES")
         
         scanner = EISScanner(output_dir=str(output_path / "scans"))
         scan_results = scanner.run_scan(
@@ -120,9 +133,7 @@ def run_pipeline(
         # =====================================================================
         # PHASE 2: WRITER
         # =====================================================================
-        logger.info("=" * 70)
-        logger.info("PHASE 2: GENERATING NEWSLETTER CONTENT")
-        logger.info("=" * 70)
+        _log_phase("PHASE 2: GENERATING NEWSLETTER CONTENT")
         
         writer = EISWriter(use_ai=use_ai)
         newsletter = writer.generate_newsletter_content(companies)
@@ -140,9 +151,7 @@ def run_pipeline(
         # =====================================================================
         # PHASE 3: MAILER
         # =====================================================================
-        logger.info("=" * 70)
-        logger.info("PHASE 3: SENDING NEWSLETTER")
-        logger.info("=" * 70)
+        _log_phase("PHASE 3: SENDING NEWSLETTER")
         
         mailer = EISMailer()
         subscribers = mailer.load_subscribers()
@@ -157,7 +166,9 @@ def run_pipeline(
         else:
             send_results = mailer.send_newsletter(
                 newsletter,
-                test_mode=dry_run
+                subscribers,
+                test_mode=dry_run,
+                concurrency=concurrency
             )
             
             results['phases']['mailer'] = {
@@ -249,6 +260,10 @@ def main():
         '--output', type=str, default='output',
         help='Output directory (default: output)'
     )
+    parser.add_argument(
+        '--concurrency', type=int, default=5,
+        help='Parallel SMTP sessions when sending (default: 5)'
+    )
     
     args = parser.parse_args()
     
@@ -259,7 +274,8 @@ def main():
         use_ai=args.ai,
         dry_run=args.dry_run,
         scan_only=args.scan_only,
-        output_dir=args.output
+        output_dir=args.output,
+        concurrency=args.concurrency
     )
     
     # Exit with appropriate code
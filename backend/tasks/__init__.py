@@ -2,11 +2,15 @@
 from .newsletter_tasks import (
     generate_company_news,
     send_scheduled_newsletters,
-    refresh_stale_cache
+    refresh_stale_cache,
+    send_portfolio_newsletter,
+    dispatch_portfolio_newsletter
 )
 
 __all__ = [
     'generate_company_news',
     'send_scheduled_newsletters',
-    'refresh_stale_cache'
+    'refresh_stale_cache',
+    'send_portfolio_newsletter',
+    'dispatch_portfolio_newsletter'
 ]
@@ -260,6 +260,50 @@ def refresh_stale_cache() -> Dict[str, Any]:
     return result
 
 
+@task
+def send_portfolio_newsletter(newsletter_data: Dict[str, Any], recipients: List[str],
+                              test_mode: bool = False, gmail_address: str = None,
+                              gmail_password: str = None) -> Dict[str, Any]:
+    """
+    Send the portfolio newsletter (automation.mailer) to a group of recipients.
+    
+    Runs on a Celery worker when a broker is configured, so SMTP latency stays
+    off the caller's request. Credentials passed in take precedence over the
+    worker's own environment. Use dispatch_portfolio_newsletter() rather than
+    calling this directly.
+    
+    Returns:
+        Dict with sent/failed counts and the subject line
+    """
+    from automation.mailer import ProfessionalNewsletterGenerator
+    
+    logger.info(f"Sending portfolio newsletter to {len(recipients)} recipients")
+    generator = ProfessionalNewsletterGenerator(gmail_address, gmail_password)
+    return generator.send_newsletter(newsletter_data, recipients, test_mode)
+
+
+def dispatch_portfolio_newsletter(newsletter_data: Dict[str, Any], recipients: List[str],
+                                  test_mode: bool = False, gmail_address: str = None,
+                                  gmail_password: str = None) -> Dict[str, Any]:
+    """
+    Send the portfolio newsletter, queuing it when a worker can pick it up.
+    
+    The newsletter is queued only when CELERY_BROKER_URL is set, since the
+    default SQLite broker has no worker behind it unless one was started
+    deliberately. The whole recipient list goes in one task and the call
+    returns the task id immediately. Otherwise the newsletter is sent
+    synchronously and the sent/failed totals are returned.
+    """
+    if CELERY_AVAILABLE and os.getenv('CELERY_BROKER_URL'):
+        job = send_portfolio_newsletter.delay(newsletter_data, recipients, test_mode,
+                                              gmail_address, gmail_password)
+        return {'queued': True, 'task_id': job.id}
+    
+    result = send_portfolio_newsletter(newsletter_data, recipients, test_mode,
+                                       gmail_address, gmail_password)
+    return dict(result, queued=False)
+
+
 def send_newsletter_email(subscriber: NewsletterSubscriber, companies: List[CompanyNewsCache]) -> bool:
     """
     Send a newsletter email to a subscriber.
@@ -0,0 +1,305 @@
+"""
+Tests for newsletter mailer module.
+"""
+
+import pytest
+import json
+import smtplib
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from automation import mailer
+from automation.mailer import EISMailer, ProfessionalNewsletterGenerator
+
+
+SENDER = "sender@example.com"
+NEWSLETTER_DATA = {"companies": [], "frequency": "Weekly"}
+
+
+class FakeSMTP:
+    """Stand-in for smtplib.SMTP_SSL that records sessions and scripted failures."""
+
+    instances = []
+    failures = {}  # recipient -> exceptions raised by successive sendmail calls
+    stalled = False  # set on an instance to make NOOP time out
+
+    def __init__(self, host, port, context=None, timeout=None):
+        self.open = True
+        self.sent = []
+        self.messages = []
+        self.timeout = timeout
+        FakeSMTP.instances.append(self)
+
+    def login(self, user, password):
+        pass
+
+    def noop(self):
+        if not self.open:
+            raise smtplib.SMTPServerDisconnected("closed")
+        if self.stalled:
+            raise TimeoutError("timed out")
+        return (250, b"OK")
+
+    def sendmail(self, sender, recipients, payload, mail_options=()):
+        if not self.open:
+            raise smtplib.SMTPServerDisconnected("closed")
+        errors = FakeSMTP.failures.get(recipients[0])
+        if errors:
+            raise errors.pop(0)
+        self.sent.append(recipients[0])
+        self.messages.append((payload, tuple(mail_options)))
+
+    def quit(self):
+        if self.stalled:
+            raise AssertionError("QUIT sent on a stalled session")
+        self.open = False
+
+    def close(self):
+        self.open = False
+
+
+@pytest.fixture
+def fake_smtp(monkeypatch):
+    """Patch SMTP_SSL with FakeSMTP and start from an empty session pool."""
+    FakeSMTP.instances = []
+    FakeSMTP.failures = {}
+    monkeypatch.setattr(smtplib, "SMTP_SSL", FakeSMTP)
+    monkeypatch.setattr(mailer, "SMTP_RETRY_BACKOFF", 0)
+    mailer._SMTP_POOL.clear()
+    yield FakeSMTP
+    mailer._SMTP_POOL.clear()
+
+
+def _send(recipients, **kwargs):
+    generator = ProfessionalNewsletterGenerator(SENDER, "password")
+    return generator.send_newsletter(NEWSLETTER_DATA, recipients, **kwargs)
+
+
+def _pooled_sessions():
+    return [server for server, _ in mailer._SMTP_POOL.get(SENDER, [])]
+
+
+def test_failed_retry_does_not_leak_or_reuse_sessions(fake_smtp, monkeypatch):
+    """Test a send that fails after reconnecting closes its session and the next recipient gets a live one."""
+    monkeypatch.setattr(mailer, "SMTP_MAX_RETRIES", 1)
+    fake_smtp.failures["a@example.com"] = [
+        smtplib.SMTPServerDisconnected("dropped"),
+        smtplib.SMTPServerDisconnected("dropped again"),
+    ]
+
+    result = _send(["a@example.com", "b@example.com"], concurrency=1)
+
+    assert result["sent"] == 1
+    assert result["failed"] == 1
+    open_sessions = [s for s in fake_smtp.instances if s.open]
+    assert open_sessions == _pooled_sessions()
+    assert open_sessions[0].sent == ["b@example.com"]
+
+
+def test_refused_recipient_keeps_session(fake_smtp):
+    """Test a permanently refused recipient does not cost a reconnect."""
+    fake_smtp.failures["a@example.com"] = [
+        smtplib.SMTPRecipientsRefused({"a@example.com": (550, b"No such user")})
+    ]
+
+    result = _send(["a@example.com", "b@example.com"], concurrency=1)
+
+    assert result == {"sent": 1, "failed": 1, "subject": result["subject"]}
+    assert len(fake_smtp.instances) == 1
+    assert fake_smtp.instances[0].sent == ["b@example.com"]
+
+
+def test_stalled_pooled_session_is_replaced(fake_smtp):
+    """Test a pooled session whose NOOP times out is closed and a fresh timed session is used."""
+    _send(["a@example.com"], concurrency=1)
+    stale = _pooled_sessions()[0]
+    stale.stalled = True
+
+    result = _send(["b@example.com"], concurrency=1)
+
+    assert result["sent"] == 1
+    assert not stale.open
+    fresh = fake_smtp.instances[-1]
+    assert fresh is not stale
+    assert fresh.sent == ["b@example.com"]
+    assert fresh.timeout == mailer.SMTP_TIMEOUT
+
+
+@pytest.fixture
+def subscribers_file(tmp_path):
+    """Subscribers file with one member and an extra key the API maintains."""
+    path = tmp_path / "subscribers.json"
+    path.write_text(json.dumps({
+        "subscribers": ["existing@example.com"],
+        "frequencies": {"existing@example.com": "weekly"}
+    }))
+    return path
+
+
+def test_add_subscriber_rejects_invalid_and_duplicate(subscribers_file):
+    """Test invalid and already subscribed addresses are not added."""
+    mailer_ = EISMailer(subscribers_file=str(subscribers_file))
+
+    added = mailer_.add_subscriber(["not-an-email", "existing@example.com", "new@example.com", "new@example.com"])
+
+    assert added == 1
+    assert mailer_.load_subscribers() == ["existing@example.com", "new@example.com"]
+    assert json.loads(subscribers_file.read_text())["subscribers"] == ["existing@example.com", "new@example.com"]
+
+
+def test_bulk_add_writes_file_once(subscribers_file, monkeypatch):
+    """Test a bulk add saves the subscribers file a single time."""
+    mailer_ = EISMailer(subscribers_file=str(subscribers_file))
+    saves = []
+    original_save = mailer_.save_subscribers
+
+    def counting_save(data):
+        saves.append(data)
+        original_save(data)
+
+    monkeypatch.setattr(mailer_, "save_subscribers", counting_save)
+
+    assert mailer_.add_subscriber([f"user{i}@example.com" for i in range(20)]) == 20
+    assert len(saves) == 1
+
+
+def test_remove_unknown_subscriber_leaves_file_untouched(subscribers_file):
+    """Test removing an address that is not subscribed does not rewrite the file."""
+    before = (subscribers_file.read_bytes(), subscribers_file.stat().st_mtime_ns)
+    mailer_ = EISMailer(subscribers_file=str(subscribers_file))
+
+    assert mailer_.remove_subscriber("nobody@example.com") is False
+    assert (subscribers_file.read_bytes(), subscribers_file.stat().st_mtime_ns) == before
+
+
+def test_save_keeps_extra_keys(subscribers_file):
+    """Test keys other than subscribers survive add and remove."""
+    mailer_ = EISMailer(subscribers_file=str(subscribers_file))
+
+    mailer_.add_subscriber("new@example.com")
+    mailer_.remove_subscriber("existing@example.com")
+
+    data = json.loads(subscribers_file.read_text())
+    assert data["subscribers"] == ["new@example.com"]
+    assert data["frequencies"] == {"existing@example.com": "weekly"}
+    assert "updated" in data
+
+
+def test_subscribers_reload_when_file_changes(subscribers_file):
+    """Test the cached list is re-read after the file is modified on disk."""
+    mailer_ = EISMailer(subscribers_file=str(subscribers_file))
+    assert mailer_.load_subscribers() == ["existing@example.com"]
+
+    stat = subscribers_file.stat()
+    subscribers_file.write_text(json.dumps({"subscribers": ["other@example.com"]}))
+    os.utime(subscribers_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert mailer_.load_subscribers() == ["other@example.com"]
+
+
+def test_pending_changes_win_until_flushed(subscribers_file):
+    """Test unflushed additions are not discarded by a reload and are written on flush."""
+    mailer_ = EISMailer(subscribers_file=str(subscribers_file))
+    mailer_.add_subscriber("new@example.com", flush=False)
+
+    stat = subscribers_file.stat()
+    os.utime(subscribers_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert mailer_.load_subscribers() == ["existing@example.com", "new@example.com"]
+    assert json.loads(subscribers_file.read_text())["subscribers"] == ["existing@example.com"]
+
+    mailer_.flush_subscribers()
+    assert json.loads(subscribers_file.read_text())["subscribers"] == ["existing@example.com", "new@example.com"]
+
+
+def test_missing_subscribers_file(tmp_path):
+    """Test a missing file reads as empty and is created by the first add."""
+    path = tmp_path / "subscribers.json"
+    mailer_ = EISMailer(subscribers_file=str(path))
+
+    assert mailer_.load_subscribers() == []
+    assert mailer_.remove_subscriber("nobody@example.com") is False
+    assert not path.exists()
+
+    assert mailer_.add_subscriber("new@example.com") == 1
+    assert json.loads(path.read_text())["subscribers"] == ["new@example.com"]
+
+
+def test_cli_manages_subscribers(subscribers_file, monkeypatch, capsys):
+    """Test the command line adds, removes and lists subscribers."""
+    monkeypatch.setattr(mailer, "SUBSCRIBERS_FILE", subscribers_file)
+
+    monkeypatch.setattr(sys, "argv", ["mailer.py", "--add-subscriber", "a@example.com", "bad", "--list-subscribers"])
+    mailer.main()
+    out = capsys.readouterr().out
+    assert "Added 1 of 2 address(es)" in out
+    assert "2 subscriber(s):" in out
+    assert "  a@example.com" in out
+
+    monkeypatch.setattr(sys, "argv", ["mailer.py", "--remove-subscriber", "existing@example.com"])
+    mailer.main()
+    assert "Removed existing@example.com" in capsys.readouterr().out
+    assert json.loads(subscribers_file.read_text())["subscribers"] == ["a@example.com"]
+
+
+def test_batches_and_failure_counts(fake_smtp):
+    """Test recipients are split into batches per session and invalid or refused addresses count as failed."""
+    recipients = [f"user{i}@example.com" for i in range(5)] + ["not-an-email"]
+    fake_smtp.failures["user3@example.com"] = [
+        smtplib.SMTPRecipientsRefused({"user3@example.com": (550, b"No such user")})
+    ]
+
+    result = _send(recipients, concurrency=2, batch_size=2)
+
+    assert result["sent"] == 4
+    assert result["failed"] == 2
+    delivered = sorted(r for s in fake_smtp.instances for r in s.sent)
+    assert delivered == ["user0@example.com", "user1@example.com", "user2@example.com", "user4@example.com"]
+    assert all(len(s.sent) <= 2 for s in fake_smtp.instances)
+
+
+def test_non_ascii_recipient_gets_its_own_smtputf8_message(fake_smtp):
+    """Test an internationalized address is delivered with its own UTF-8 message instead of patched bytes."""
+    result = _send(["josé@example.com", "a@example.com"], concurrency=1)
+
+    assert result["sent"] == 2
+    assert result["failed"] == 0
+    (intl_payload, intl_options), (ascii_payload, ascii_options) = fake_smtp.instances[0].messages
+    assert intl_options == ("SMTPUTF8",)
+    assert "To: josé@example.com" in intl_payload.decode("utf-8")
+    assert ascii_options == ()
+    assert b"To: a@example.com" in ascii_payload
+    assert mailer.RCPT_PLACEHOLDER not in intl_payload + ascii_payload
+
+
+def test_test_mode_counts_invalid_addresses_as_failed(fake_smtp):
+    """Test a dry run reports dropped invalid addresses the same way a live send does."""
+    result = _send(["a@example.com", "not-an-email"], test_mode=True)
+
+    assert result["sent"] == 1
+    assert result["failed"] == 1
+    assert fake_smtp.instances == []
+
+
+def test_missing_credentials_fail_every_recipient(fake_smtp):
+    """Test sending without Gmail credentials fails all recipients without connecting."""
+    generator = ProfessionalNewsletterGenerator(SENDER, None)
+    generator.gmail_password = None
+
+    result = generator.send_newsletter(NEWSLETTER_DATA, ["a@example.com", "b@example.com"])
+
+    assert result["sent"] == 0
+    assert result["failed"] == 2
+    assert fake_smtp.instances == []
+
+
+def test_oversized_json_rejected_without_reading(tmp_path, monkeypatch):
+    """Test a file over MAX_JSON_BYTES is refused on its size alone."""
+    path = tmp_path / "newsletter.json"
+    path.write_text(json.dumps({"companies": ["x" * 100]}))
+    monkeypatch.setattr(mailer, "MAX_JSON_BYTES", 10)
+    monkeypatch.setattr(type(path), "read_bytes", lambda self: pytest.fail("file was read"))
+
+    with pytest.raises(ValueError):
+        mailer._read_json_file(path)
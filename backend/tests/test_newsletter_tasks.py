@@ -0,0 +1,79 @@
+"""
+Tests for newsletter background tasks.
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+pytest.importorskip("sqlalchemy")
+
+from tasks import newsletter_tasks
+from tasks.newsletter_tasks import dispatch_portfolio_newsletter
+from automation.mailer import ProfessionalNewsletterGenerator
+
+
+RECIPIENTS = ["a@example.com", "b@example.com", "c@example.com"]
+
+
+def test_dispatch_without_celery_sends_inline(monkeypatch):
+    """Test the no-Celery fallback sends once to every recipient and returns the totals."""
+    calls = []
+
+    def fake_send(self, newsletter_data, recipients, test_mode=False):
+        calls.append(list(recipients))
+        return {"sent": len(recipients) - 1, "failed": 1, "subject": "Subject"}
+
+    monkeypatch.setattr(newsletter_tasks, "CELERY_AVAILABLE", False)
+    monkeypatch.setattr(ProfessionalNewsletterGenerator, "send_newsletter", fake_send)
+
+    result = dispatch_portfolio_newsletter({"companies": []}, RECIPIENTS)
+
+    assert calls == [RECIPIENTS]
+    assert result == {"sent": 2, "failed": 1, "subject": "Subject", "queued": False}
+
+
+def test_dispatch_without_broker_sends_inline(monkeypatch):
+    """Test Celery alone does not queue; without CELERY_BROKER_URL the send happens inline with the given credentials."""
+    senders = []
+
+    def fake_send(self, newsletter_data, recipients, test_mode=False):
+        senders.append((self.gmail_address, self.gmail_password))
+        return {"sent": len(recipients), "failed": 0, "subject": "Subject"}
+
+    monkeypatch.setattr(newsletter_tasks, "CELERY_AVAILABLE", True)
+    monkeypatch.delenv("CELERY_BROKER_URL", raising=False)
+    monkeypatch.setattr(ProfessionalNewsletterGenerator, "send_newsletter", fake_send)
+
+    result = dispatch_portfolio_newsletter({"companies": []}, RECIPIENTS,
+                                           gmail_address="me@example.com", gmail_password="secret")
+
+    assert result["queued"] is False
+    assert result["sent"] == 3
+    assert senders == [("me@example.com", "secret")]
+
+
+def test_dispatch_with_broker_queues_one_task(monkeypatch):
+    """Test the whole recipient list and the credentials are queued as a single task."""
+    queued = []
+
+    class FakeJob:
+        id = "job-1"
+
+    class FakeTask:
+        @staticmethod
+        def delay(*args):
+            queued.append(args)
+            return FakeJob()
+
+    monkeypatch.setattr(newsletter_tasks, "CELERY_AVAILABLE", True)
+    monkeypatch.setenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
+    monkeypatch.setattr(newsletter_tasks, "send_portfolio_newsletter", FakeTask)
+
+    result = dispatch_portfolio_newsletter({"companies": []}, RECIPIENTS,
+                                           gmail_address="me@example.com", gmail_password="secret")
+
+    assert result == {"queued": True, "task_id": "job-1"}
+    assert queued == [({"companies": []}, RECIPIENTS, False, "me@example.com", "secret")]
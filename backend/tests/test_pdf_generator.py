@@ -0,0 +1,49 @@
+"""
+Tests for research report PDF generator.
+"""
+
+import pytest
+import re
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from automation.pdf_generator import TEMPLATE_DIR, generate_report_html
+
+
+SAMPLE_REPORT = {
+    "company_name": "Test Company Ltd",
+    "generated_at": "2025-01-15T09:30:00",
+    "company_overview": {"business_description": "AI solutions."},
+    "news": [{"title": "Product launch", "content": "Exciting launch"}],
+    "references": [{"title": "Company Website", "url": "https://example.com"}]
+}
+
+
+def test_stylesheet_has_no_unused_classes():
+    """Test every class selector in the report stylesheet is used by the template."""
+    css = (TEMPLATE_DIR / 'research_report.css').read_text(encoding='utf-8')
+    html = generate_report_html(SAMPLE_REPORT)
+
+    used = set()
+    for value in re.findall(r'class="([^"]*)"', html):
+        used.update(value.split())
+
+    declared = set(re.findall(r'\.([a-zA-Z][\w-]*)', css))
+    assert declared - used == set()
+
+
+def test_report_html_escapes_fields():
+    """Test report fields are HTML-escaped."""
+    report = dict(SAMPLE_REPORT, company_name="<script>alert(1)</script>")
+    html = generate_report_html(report)
+
+    assert "<script>" not in html
+    assert "&lt;script&gt;" in html
+
+
+def test_report_html_without_inline_styles():
+    """Test the style block can be left out for PDF rendering."""
+    assert "<style>" in generate_report_html(SAMPLE_REPORT)
+    assert "<style>" not in generate_report_html(SAMPLE_REPORT, inline_styles=False)